@@ -17,6 +17,7 @@ from src.api.routes.liquidity_routes import router as liquidity_router
 # Import additional routers as needed
 
 from src.utils.performance_monitor import performance_monitor, time_function
+from src.utils.birdeye_client import birdeye_client
 
 logger = logging.getLogger(__name__)
 
@@ -110,4 +111,6 @@ async def root():
 async def shutdown_event():
     """Perform cleanup on application shutdown."""
     logger.info("Application shutting down")
+    # Close shared HTTP sessions so their connectors aren't leaked
+    await birdeye_client.close()
     # Add cleanup code here as needed 
\ No newline at end of file
@@ -6,15 +6,32 @@ import logging
 import time
 import asyncio
 from typing import Dict, List, Any, Optional, Union, Tuple
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 import numpy as np
-from pymongo import DESCENDING
+from pymongo import ASCENDING, DESCENDING
 
 from src.dex.dex_aggregator import dex_aggregator
 from src.services.database_service import database_service
 
 logger = logging.getLogger(__name__)
 
+
+@dataclass(slots=True)
+class LiquiditySeries:
+    """Total liquidity history of a token as parallel arrays, oldest first."""
+    timestamps: np.ndarray  # datetime64[ms]
+    liquidity: np.ndarray   # float64, USD
+    
+    def __len__(self) -> int:
+        return self.liquidity.size
+    
+    @classmethod
+    def empty(cls) -> "LiquiditySeries":
+        """Create a series with no data points."""
+        return cls(np.empty(0, dtype="datetime64[ms]"), np.empty(0, dtype=np.float64))
+
+
 class LiquidityHistoryTracker:
     """Tracks and analyzes historical liquidity data for tokens."""
     
@@ -125,6 +142,44 @@ class LiquidityHistoryTracker:
             logger.error(f"Error getting liquidity history for {token_address}: {e}", exc_info=True)
             return []
     
+    async def get_liquidity_series(self, token_address: str, days: int = 30) -> LiquiditySeries:
+        """
+        Get the total liquidity history of a token as NumPy arrays.
+        
+        Only aggregate snapshots are read (DEX-specific snapshots carry no total),
+        and only the two fields needed are fetched from the database.
+        
+        Args:
+            token_address: Token mint address
+            days: Number of days of history to retrieve
+            
+        Returns:
+            LiquiditySeries: Timestamps and total liquidity, oldest first
+        """
+        try:
+            # Calculate start date
+            start_date = datetime.utcnow() - timedelta(days=days)
+            
+            cursor = self.liquidity_history_collection.find(
+                {
+                    "token_address": token_address,
+                    "timestamp": {"$gte": start_date},
+                    "total_liquidity_usd": {"$exists": True}
+                },
+                {"_id": 0, "timestamp": 1, "total_liquidity_usd": 1}
+            ).sort("timestamp", ASCENDING)
+            
+            docs = await cursor.to_list(length=None)
+            
+            return LiquiditySeries(
+                np.array([doc["timestamp"] for doc in docs], dtype="datetime64[ms]"),
+                np.fromiter((doc["total_liquidity_usd"] or 0 for doc in docs), dtype=np.float64, count=len(docs))
+            )
+            
+        except Exception as e:
+            logger.error(f"Error getting liquidity series for {token_address}: {e}", exc_info=True)
+            return LiquiditySeries.empty()
+    
     async def get_liquidity_change_metrics(self, token_address: str, days: int = 7) -> Dict[str, Any]:
         """
         Calculate liquidity change metrics over a period.
@@ -11,6 +11,7 @@ from datetime import datetime
 from src.blockchain.solana_client import solana_client, SolanaClientError
 from src.dex.dex_aggregator import dex_aggregator
 from src.utils.token_utils import is_token_program
+from src.utils.persistent_cache import PersistentCache, dumps, loads
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +23,8 @@ class LpTokenTracker:
         self.lp_token_cache = {}
         self.lp_token_cache_ttl = 3600  # 1 hour
         self.lp_token_cache_time = {}
+        # Cross-process L2 so restarted workers start warm
+        self._l2 = PersistentCache(prefix="lp:")
     
     async def get_lp_tokens_for_token(self, token_address: str) -> List[Dict[str, Any]]:
         """
@@ -77,6 +80,26 @@ class LpTokenTracker:
             now - self.lp_token_cache_time.get(lp_token_address, 0) < self.lp_token_cache_ttl):
             return self.lp_token_cache[lp_token_address]
         
+        # Check persistent cache
+        raw = await self._l2.get(lp_token_address)
+        lp_data = None
+        if raw:
+            try:
+                lp_data = loads(raw)
+                if not isinstance(lp_data, dict):
+                    raise ValueError(f"expected an object, got {type(lp_data).__name__}")
+            except Exception as e:
+                lp_data = None
+                # Corrupt or old-format entry: drop it and read from chain instead
+                logger.warning(f"Discarding unreadable cached LP token data for {lp_token_address}: {e}")
+                await self._l2.delete(lp_token_address)
+        if lp_data is not None:
+            self.lp_token_cache[lp_token_address] = lp_data
+            # Age from when the entry was written, not when it was read back,
+            # so L1 never extends data that has already sat in L2
+            self.lp_token_cache_time[lp_token_address] = lp_data.get("last_updated", 0)
+            return lp_data
+        
         try:
             # Get LP token data from blockchain
             token_info = await solana_client.get_token_info(lp_token_address)
@@ -105,12 +128,6 @@ class LpTokenTracker:
                 "last_updated": int(now)
             }
             
-            # Update cache
-            self.lp_token_cache[lp_token_address] = lp_data
-            self.lp_token_cache_time[lp_token_address] = now
-            
-            return lp_data
-            
         except Exception as e:
             logger.error(f"Error getting LP token data for {lp_token_address}: {e}", exc_info=True)
             return {
@@ -118,6 +135,16 @@ class LpTokenTracker:
                 "valid": False,
                 "error": str(e)
             }
+        
+        # Update cache; a failed cache write must not discard a good chain read
+        self.lp_token_cache[lp_token_address] = lp_data
+        self.lp_token_cache_time[lp_token_address] = now
+        try:
+            await self._l2.setex(lp_token_address, self.lp_token_cache_ttl, dumps(lp_data))
+        except Exception as e:
+            logger.warning(f"Failed to persist LP token data for {lp_token_address}: {e}")
+        
+        return lp_data
     
     async def _get_top_holders(self, lp_token_address: str, limit: int = 5) -> List[Dict[str, Any]]:
         """
@@ -6,16 +6,95 @@ import logging
 import time
 import json
 import asyncio
+import random
+import sys
+import functools
+import types
+from collections import OrderedDict
 from typing import Dict, List, Any, Optional, Union, Tuple
 import aiohttp
+import numpy as np
+from dataclasses import dataclass, asdict
 from datetime import datetime
 
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - optional dependency
+    njit = None
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:  # pragma: no cover - optional dependency
+    _json_loads = json.loads
+    _json_dumps = json.dumps
+
 from config.config import config
 from src.utils.circuit_breaker import circuit_breaker
 from src.blockchain.solana_client import solana_client, SolanaClientError
 
 logger = logging.getLogger(__name__)
 
+_ALLOWED_METHODS = frozenset({"GET", "POST"})
+_NO_POSITIONS = np.empty(0, dtype=np.intp)
+_JSON_HEADERS = types.MappingProxyType({"Content-Type": "application/json"})
+
+
+@functools.lru_cache(maxsize=256)
+def _endpoint_url(base: str, endpoint: str) -> str:
+    """Join the API base URL and an endpoint path."""
+    return f"{base}/{endpoint.lstrip('/')}"
+
+
+def _aggregate_pools_kernel(liquidity: np.ndarray, volume: np.ndarray) -> Tuple[float, float, float, int]:
+    """
+    Sum liquidity and volume and locate the largest pool in one fused loop.
+    
+    Args:
+        liquidity: Pool liquidity column
+        volume: Pool 24h volume column
+        
+    Returns:
+        Tuple: (total liquidity, total volume, max liquidity, index of max or -1)
+    """
+    sum_liq = 0.0
+    sum_vol = 0.0
+    max_liq = 0.0
+    argmax_liq = -1
+    for i in range(liquidity.shape[0]):
+        liq = liquidity[i]
+        sum_liq += liq
+        sum_vol += volume[i]
+        if argmax_liq < 0 or liq > max_liq:
+            max_liq = liq
+            argmax_liq = i
+    return sum_liq, sum_vol, max_liq, argmax_liq
+
+
+def _aggregate_pools_numpy(liquidity: np.ndarray, volume: np.ndarray) -> Tuple[float, float, float, int]:
+    """Fallback for aggregate_pools when numba is not installed."""
+    if not liquidity.size:
+        return 0.0, float(volume.sum()), 0.0, -1
+    argmax_liq = int(liquidity.argmax())
+    return float(liquidity.sum()), float(volume.sum()), float(liquidity[argmax_liq]), argmax_liq
+
+
+# Compiled once per process (and cached on disk) when numba is available
+aggregate_pools = njit(cache=True)(_aggregate_pools_kernel) if njit is not None else _aggregate_pools_numpy
+
+@dataclass(slots=True)
+class PriceImpact:
+    """Price impact of a single trade size against a pool."""
+    pool_id: str
+    token_address: str
+    amount_usd: float
+    liquidity_usd: float
+    pool_type: str
+    price_impact_percent: float
+    slippage_percent: float
+
+
 # Custom exceptions
 class OrcaClientError(Exception):
     """Base exception for Orca client errors."""
@@ -36,33 +115,201 @@ class OrcaClient:
         """Initialize the Orca client."""
         self.api_url = config.get("dex", {}).get("orca", {}).get("api_url", "https://api.orca.so")
         self.session = None
-        self.request_count = 0
-        self.last_reset = time.time()
         self.rate_limit = 60  # Default rate limit per minute
+        self.rate_window = 60.0  # Seconds before a rate-limit slot is returned
+        self._rate_sem: Optional[asyncio.Semaphore] = None
         self.max_retries = 3
         self.retry_delay = 1.0
+        self.jitter = 0.5
+        self.max_delay = 30.0
+        self.max_connections = 50
+        self.max_connections_per_host = 20
+        
+        # Conditional GET support (LRU, opt-in): (endpoint, params) -> (ETag, raw body).
+        # Raw bodies are re-parsed on a 304 so every caller gets its own objects.
+        self.use_conditional_requests = config.get("dex", {}).get("orca", {}).get("conditional_requests", False)
+        self._etag_cache: OrderedDict[Tuple[str, Tuple[Tuple[str, str], ...]], Tuple[str, bytes]] = OrderedDict()
+        self._etag_cache_max = 256
         self.initialized = False
         
         # Pool cache
-        self.pools_cache = {}
-        self.whirlpools_cache = {}
+        # Stored as tuples so callers can share them without copying or mutating
+        self.pools_cache: Tuple[Dict[str, Any], ...] = ()
+        self.whirlpools_cache: Tuple[Dict[str, Any], ...] = ()
+        # Each cache keeps its own age and TTL, adapted to how fast its pools change
         self.pools_last_updated = 0
+        self.whirlpools_last_updated = 0
         self.pools_cache_ttl = 300  # 5 minutes
+        self.whirlpools_cache_ttl = 300
+        self.base_pools_cache_ttl = 300
+        self.min_pools_cache_ttl = 60
+        self.max_pools_cache_ttl = 1800
+        self.max_ttl_step = 2.0  # A refresh can at most double or halve a TTL
+        # EWMA of relative liquidity change per refresh, per cache
+        self._pools_change_rate: Optional[float] = None
+        self._whirlpools_change_rate: Optional[float] = None
+        self._change_rate_alpha = 0.3
+        
+        # Token mint -> pools indexes, rebuilt on every cache refresh
+        self._token_to_v2_pools: Dict[str, Tuple[Dict[str, Any], ...]] = {}
+        self._token_to_whirlpools: Dict[str, Tuple[Dict[str, Any], ...]] = {}
+        self._pools_by_id: Dict[str, Dict[str, Any]] = {}
+        self._wp_by_id: Dict[str, Dict[str, Any]] = {}
+        
+        # Columnar (SoA) views of the pool caches for vectorized aggregates.
+        # Token position arrays index into these columns in cache order.
+        self._v2_liq_arr = np.empty(0, dtype=np.float64)
+        self._v2_vol_arr = np.empty(0, dtype=np.float64)
+        self._wp_liq_arr = np.empty(0, dtype=np.float64)
+        self._wp_vol_arr = np.empty(0, dtype=np.float64)
+        self._token_to_v2_positions: Dict[str, np.ndarray] = {}
+        self._token_to_wp_positions: Dict[str, np.ndarray] = {}
+        
+        # In-flight refreshes shared by concurrent callers (single-flight)
+        self._whirlpools_inflight: Optional[asyncio.Future] = None
+        self._pools_inflight: Optional[asyncio.Future] = None
+        
+        # Invalidate the pool caches on on-chain program updates instead of waiting
+        # for the TTL. Off by default: programSubscribe on busy programs is chatty.
+        self.subscribe_program_updates = config.get("dex", {}).get("orca", {}).get("subscribe_program_updates", False)
+        self._subscription_task: Optional[asyncio.Task] = None
+        # A notification expires its cache at most this many seconds later, so a
+        # burst of account updates costs one refresh rather than one per update
+        self.program_update_debounce = 30.0
     
     async def initialize(self):
         """Initialize the client session."""
         if not self.initialized:
-            self.session = aiohttp.ClientSession()
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_connections_per_host,
+                ttl_dns_cache=300,
+                keepalive_timeout=60
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+            if self._rate_sem is None:
+                self._rate_sem = asyncio.Semaphore(self.rate_limit)
+            if self.subscribe_program_updates and self._subscription_task is None:
+                self._subscription_task = asyncio.create_task(self._subscribe_program_updates())
             self.initialized = True
             logger.info("Orca client initialized")
     
     async def close(self):
         """Close the client session."""
+        if self._subscription_task is not None:
+            self._subscription_task.cancel()
+            try:
+                await self._subscription_task
+            except asyncio.CancelledError:
+                pass
+            self._subscription_task = None
+        
         if self.session and not self.session.closed:
             await self.session.close()
+            # Give the connector time to finish closing underlying transports
+            await asyncio.sleep(0.1)
             self.initialized = False
             logger.info("Orca client closed")
     
+    async def _subscribe_program_updates(self):
+        """
+        Subscribe to Orca program account updates and invalidate pool caches on change.
+        
+        Reconnects with backoff until cancelled.
+        """
+        ws_url = solana_client.rpc_url.replace("https://", "wss://", 1).replace("http://", "ws://", 1)
+        program_ids = (self.ORCA_WHIRLPOOL_PROGRAM_ID, self.ORCA_V2_PROGRAM_ID)
+        attempt = 0
+        
+        while True:
+            try:
+                async with self.session.ws_connect(ws_url, heartbeat=30) as ws:
+                    pending: Dict[int, str] = {}  # Request id -> program id awaiting confirmation
+                    subscriptions: Dict[int, str] = {}  # Subscription id -> program id
+                    for request_id, program_id in enumerate(program_ids, start=1):
+                        pending[request_id] = program_id
+                        await ws.send_json({
+                            "jsonrpc": "2.0",
+                            "id": request_id,
+                            "method": "programSubscribe",
+                            # Only the change signal is needed, not the account data
+                            "params": [program_id, {
+                                "encoding": "base64",
+                                "commitment": "confirmed",
+                                "dataSlice": {"offset": 0, "length": 0}
+                            }]
+                        })
+                    
+                    async for msg in ws:
+                        if msg.type == aiohttp.WSMsgType.TEXT:
+                            payload = _json_loads(msg.data)
+                            if payload.get("method") == "programNotification":
+                                params = payload.get("params", {})
+                                value = params.get("result", {}).get("value", {})
+                                self._on_program_notification(
+                                    subscriptions.get(params.get("subscription")), value.get("pubkey")
+                                )
+                            elif payload.get("id") in pending:
+                                program_id = pending.pop(payload["id"])
+                                if "error" in payload:
+                                    logger.warning(f"Orca programSubscribe failed for {program_id}: {payload['error']}")
+                                else:
+                                    subscriptions[payload.get("result")] = program_id
+                                    attempt = 0
+                                    logger.info(f"Subscribed to Orca program updates for {program_id}")
+                                if not pending and not subscriptions:
+                                    break  # Nothing subscribed; reconnect with backoff
+                        elif msg.type == aiohttp.WSMsgType.ERROR:
+                            break
+                        
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Orca program subscription failed: {e}")
+            
+            attempt += 1
+            await self._sleep_backoff(attempt)
+    
+    def _on_program_notification(self, program_id: Optional[str], pubkey: Optional[str]) -> None:
+        """
+        Expire the cache holding an updated pool account, debounced.
+        
+        Updates to accounts that are not cached are ignored, and a cache expires
+        at most program_update_debounce seconds after the first relevant update.
+        
+        Args:
+            program_id: Program whose subscription fired, if known
+            pubkey: Updated account
+        """
+        now = time.time()
+        if program_id != self.ORCA_V2_PROGRAM_ID and pubkey in self._wp_by_id:
+            self.whirlpools_last_updated = min(
+                self.whirlpools_last_updated,
+                now - self.whirlpools_cache_ttl + self.program_update_debounce
+            )
+        if program_id != self.ORCA_WHIRLPOOL_PROGRAM_ID and pubkey in self._pools_by_id:
+            self.pools_last_updated = min(
+                self.pools_last_updated,
+                now - self.pools_cache_ttl + self.program_update_debounce
+            )
+    
+    async def _sleep_backoff(self, attempt: int) -> float:
+        """
+        Sleep for an exponentially growing, jittered delay.
+        
+        Args:
+            attempt: Retry attempt number
+            
+        Returns:
+            float: Delay slept in seconds
+        """
+        delay = min(self.retry_delay * (2 ** attempt) * (1 + random.random() * self.jitter), self.max_delay)
+        await asyncio.sleep(delay)
+        return delay
+    
     @circuit_breaker("orca_api", failure_threshold=5, timeout=60.0)
     async def _make_request(self, endpoint: str, method: str = "GET", 
                             params: Dict[str, Any] = None, data: Dict = None) -> Dict[str, Any]:
@@ -80,75 +327,85 @@ class OrcaClient:
             
         Raises:
             OrcaClientError: On request failure
-            OrcaRateLimitError: When rate limited
         """
+        method = method.upper()
+        if method not in _ALLOWED_METHODS:
+            raise OrcaClientError(f"Unsupported HTTP method: {method}")
+        
         if not self.initialized:
             await self.initialize()
         
-        # Check rate limiting
-        now = time.time()
-        if now - self.last_reset > 60:
-            self.request_count = 0
-            self.last_reset = now
-        
-        self.request_count += 1
+        # Sliding-window rate limiting: each request holds a slot for rate_window
+        # seconds, so callers wait for capacity instead of failing during bursts
+        await self._rate_sem.acquire()
+        asyncio.get_running_loop().call_later(self.rate_window, self._rate_sem.release)
         
-        # Apply rate limiting
-        if self.request_count > self.rate_limit:
-            delay = 60 - (now - self.last_reset)
-            if delay > 0:
-                raise OrcaRateLimitError(f"Rate limit exceeded. Try again in {delay:.2f} seconds")
+        url = _endpoint_url(self.api_url, endpoint)
+        headers = _JSON_HEADERS
+        body = _json_dumps(data) if data is not None and method == "POST" else None
         
-        url = f"{self.api_url}/{endpoint.lstrip('/')}"
-        headers = {"Content-Type": "application/json"}
+        # Let the server answer 304 Not Modified for unchanged GET payloads
+        etag_key = None
+        cached = None
+        if self.use_conditional_requests and method == "GET":
+            # Stringified so unhashable param values (e.g. lists) still make a key
+            etag_key = (endpoint, tuple(sorted((k, str(v)) for k, v in params.items())) if params else ())
+            cached = self._etag_cache.get(etag_key)
+            if cached:
+                self._etag_cache.move_to_end(etag_key)
+                headers = {**_JSON_HEADERS, "If-None-Match": cached[0]}
         
         retries = 0
         while retries <= self.max_retries:
             try:
-                if method.upper() == "GET":
-                    async with self.session.get(url, params=params, headers=headers) as response:
-                        if response.status == 429:  # Rate limited
-                            retries += 1
-                            delay = self.retry_delay * (2 ** retries)
-                            logger.warning(f"Rate limited by Orca API. Retrying in {delay:.2f}s")
-                            await asyncio.sleep(delay)
-                            continue
-                        
-                        response.raise_for_status()
-                        return await response.json()
-                        
-                elif method.upper() == "POST":
-                    async with self.session.post(url, params=params, json=data, headers=headers) as response:
-                        if response.status == 429:  # Rate limited
-                            retries += 1
-                            delay = self.retry_delay * (2 ** retries)
-                            logger.warning(f"Rate limited by Orca API. Retrying in {delay:.2f}s")
-                            await asyncio.sleep(delay)
-                            continue
-                        
-                        response.raise_for_status()
-                        return await response.json()
-                
-                else:
-                    raise OrcaClientError(f"Unsupported HTTP method: {method}")
+                async with self.session.request(method, url, params=params, data=body, headers=headers) as response:
+                    if response.status == 429:  # Rate limited
+                        retries += 1
+                        if retries > self.max_retries:
+                            break
+                        delay = await self._sleep_backoff(retries)
+                        logger.warning(f"Rate limited by Orca API. Retried after {delay:.2f}s")
+                        continue
+                    
+                    # Use the entry sent with the request; it may have been evicted since
+                    if response.status == 304 and cached:
+                        return _json_loads(cached[1])
+                    
+                    response.raise_for_status()
+                    raw = await response.read()
+                    result = _json_loads(raw)
+                    
+                    if etag_key is not None:
+                        etag = response.headers.get("ETag")
+                        if etag:
+                            self._etag_cache[etag_key] = (etag, raw)
+                            self._etag_cache.move_to_end(etag_key)
+                            while len(self._etag_cache) > self._etag_cache_max:
+                                self._etag_cache.popitem(last=False)
+                    
+                    return result
                     
             except aiohttp.ClientResponseError as e:
-                if e.status == 429:  # Rate limited
-                    retries += 1
-                    delay = self.retry_delay * (2 ** retries)
-                    logger.warning(f"Rate limited by Orca API. Retrying in {delay:.2f}s")
-                    await asyncio.sleep(delay)
+                # Client errors other than 429 will never succeed on retry
+                if 400 <= e.status < 500 and e.status != 429:
+                    logger.error(f"Orca API error: {e}")
+                    raise OrcaClientError(f"Unrecoverable HTTP {e.status}: {e}")
+                
+                # 429 and 5xx are transient
+                retries += 1
+                if retries <= self.max_retries:
+                    delay = await self._sleep_backoff(retries)
+                    logger.warning(f"Orca API error {e.status}. Retried after {delay:.2f}s")
                     continue
                 
-                logger.error(f"Orca API error: {e}")
+                logger.error(f"Orca API error after {retries} retries: {e}")
                 raise OrcaClientError(f"API error: {e}")
                 
             except aiohttp.ClientError as e:
                 retries += 1
                 if retries <= self.max_retries:
-                    delay = self.retry_delay * (2 ** retries)
-                    logger.warning(f"Orca API request failed: {e}. Retrying in {delay:.2f}s")
-                    await asyncio.sleep(delay)
+                    delay = await self._sleep_backoff(retries)
+                    logger.warning(f"Orca API request failed: {e}. Retried after {delay:.2f}s")
                     continue
                 
                 logger.error(f"Orca API request failed after {retries} retries: {e}")
@@ -156,7 +413,111 @@ class OrcaClient:
                 
         raise OrcaClientError(f"Failed after {self.max_retries} retries")
     
-    async def get_all_whirlpools(self, force_refresh: bool = False) -> List[Dict[str, Any]]:
+    def _clear_whirlpools_inflight(self, _future: asyncio.Future) -> None:
+        """Forget the finished Whirlpool refresh so the next expiry starts a new one."""
+        self._whirlpools_inflight = None
+    
+    def _clear_pools_inflight(self, _future: asyncio.Future) -> None:
+        """Forget the finished v2 pool refresh so the next expiry starts a new one."""
+        self._pools_inflight = None
+    
+    @staticmethod
+    def _build_columns(pools: Tuple[Dict[str, Any], ...]) -> Tuple[np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Build columnar liquidity/volume arrays and per-token position arrays.
+        
+        Args:
+            pools: List of pools
+            
+        Returns:
+            Tuple: (liquidity array, volume array, token mint -> positions)
+        """
+        liquidity = np.fromiter((pool["liquidity"] for pool in pools), dtype=np.float64, count=len(pools))
+        volume = np.fromiter((pool["volume_24h"] for pool in pools), dtype=np.float64, count=len(pools))
+        
+        positions: Dict[str, List[int]] = {}
+        for i, pool in enumerate(pools):
+            positions.setdefault(pool["token_a"], []).append(i)
+            if pool["token_b"] != pool["token_a"]:
+                positions.setdefault(pool["token_b"], []).append(i)
+        
+        return liquidity, volume, {token: np.array(idx, dtype=np.intp) for token, idx in positions.items()}
+    
+    def _adapt_ttl(self, old_by_id: Dict[str, Dict[str, Any]], new_pools: Tuple[Dict[str, Any], ...],
+                   change_rate: Optional[float], ttl: float) -> Tuple[Optional[float], float]:
+        """
+        Adapt one pool cache's TTL to the observed rate of liquidity change.
+        
+        Stable data lengthens the TTL; fast-moving data shortens it, by at most
+        a factor of max_ttl_step per refresh.
+        
+        Args:
+            old_by_id: Pool id -> pool from the previous refresh
+            new_pools: Freshly fetched pools
+            change_rate: The cache's current change-rate EWMA, None before the first comparison
+            ttl: The cache's current TTL
+            
+        Returns:
+            Tuple: (updated change rate, updated TTL)
+        """
+        if not old_by_id:
+            return change_rate, ttl
+        
+        old_total = sum(pool["liquidity"] for pool in old_by_id.values())
+        changed = 0
+        for pool in new_pools:
+            old_pool = old_by_id.get(pool["id"])
+            if old_pool is not None:
+                changed += abs(pool["liquidity"] - old_pool["liquidity"])
+        delta = changed / max(old_total, 1)
+        
+        if change_rate is None:
+            change_rate = delta
+        else:
+            change_rate += self._change_rate_alpha * (delta - change_rate)
+        
+        target = self.base_pools_cache_ttl * (0.1 / max(change_rate, 1e-3))
+        target = max(ttl / self.max_ttl_step, min(target, ttl * self.max_ttl_step))
+        return change_rate, max(self.min_pools_cache_ttl, min(target, self.max_pools_cache_ttl))
+    
+    @staticmethod
+    def _intern_pool_keys(pools: Tuple[Dict[str, Any], ...]) -> None:
+        """
+        Intern the address strings used as index keys so lookups can match on identity.
+        
+        Args:
+            pools: List of pools, updated in place
+        """
+        for pool in pools:
+            pool["token_a"] = sys.intern(pool["token_a"])
+            pool["token_b"] = sys.intern(pool["token_b"])
+            pool["program_id"] = sys.intern(pool["program_id"])
+    
+    def _pools_cache_fresh(self, pool_type: str) -> bool:
+        """Check whether the whirlpool or v2 pool cache is within its TTL."""
+        if pool_type == "whirlpool":
+            return time.time() - self.whirlpools_last_updated < self.whirlpools_cache_ttl
+        return time.time() - self.pools_last_updated < self.pools_cache_ttl
+    
+    @staticmethod
+    def _build_token_index(pools: Tuple[Dict[str, Any], ...]) -> Dict[str, Tuple[Dict[str, Any], ...]]:
+        """
+        Build an inverted index from token mint to the pools containing it.
+        
+        Args:
+            pools: List of pools
+            
+        Returns:
+            Dict: Token mint -> tuple of pools
+        """
+        index: Dict[str, List[Dict[str, Any]]] = {}
+        for pool in pools:
+            index.setdefault(pool["token_a"], []).append(pool)
+            if pool["token_b"] != pool["token_a"]:
+                index.setdefault(pool["token_b"], []).append(pool)
+        return {token: tuple(token_pools) for token, token_pools in index.items()}
+    
+    async def get_all_whirlpools(self, force_refresh: bool = False) -> Tuple[Dict[str, Any], ...]:
         """
         Get all Orca Whirlpools (concentrated liquidity).
         
@@ -164,57 +525,23 @@ class OrcaClient:
             force_refresh: Force refresh the pools cache
             
         Returns:
-            List[Dict]: List of Whirlpools
+            Tuple[Dict]: Whirlpools
         """
         now = time.time()
         
         # Check if we can use cached data
         if (not force_refresh and 
             self.whirlpools_cache and 
-            now - self.pools_last_updated < self.pools_cache_ttl):
+            now - self.whirlpools_last_updated < self.whirlpools_cache_ttl):
             return self.whirlpools_cache
         
+        # Join an in-flight refresh rather than starting a duplicate fetch
+        if self._whirlpools_inflight is None:
+            self._whirlpools_inflight = asyncio.ensure_future(self._do_fetch_whirlpools())
+            self._whirlpools_inflight.add_done_callback(self._clear_whirlpools_inflight)
+        
         try:
-            # Orca doesn't have a direct API for this, so we need to query the on-chain data
-            # For now, we'll use a simplified approach with mock data
-            # In a real implementation, we'd use Solana RPC calls to get pool data
-            
-            # Mock data for now - would be replaced with actual implementation
-            whirlpools = [
-                {
-                    "id": "whirlpool1",
-                    "token_a": "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",  # USDC
-                    "token_b": "So11111111111111111111111111111111111111112",  # Wrapped SOL
-                    "token_a_name": "USDC",
-                    "token_b_name": "SOL",
-                    "liquidity": 8000000,
-                    "volume_24h": 1500000,
-                    "fee_rate": 0.003,
-                    "price": 22.4,
-                    "tick_spacing": 64,
-                    "program_id": self.ORCA_WHIRLPOOL_PROGRAM_ID
-                },
-                {
-                    "id": "whirlpool2",
-                    "token_a": "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",  # USDC
-                    "token_b": "Es9vMFrzaCERmJfrF4H2FYD4KCoNkY11McCe8BenwNYB",  # USDT
-                    "token_a_name": "USDC",
-                    "token_b_name": "USDT",
-                    "liquidity": 12000000,
-                    "volume_24h": 5000000,
-                    "fee_rate": 0.0005,
-                    "price": 1.002,
-                    "tick_spacing": 1,
-                    "program_id": self.ORCA_WHIRLPOOL_PROGRAM_ID
-                }
-            ]
-            
-            # Update cache
-            self.whirlpools_cache = whirlpools
-            self.pools_last_updated = now
-            
-            return whirlpools
-            
+            return await asyncio.shield(self._whirlpools_inflight)
         except Exception as e:
             logger.error(f"Error getting Orca whirlpools: {e}", exc_info=True)
             
@@ -225,7 +552,62 @@ class OrcaClient:
                 
             raise OrcaClientError(f"Failed to get whirlpools: {e}")
     
-    async def get_all_pools(self, force_refresh: bool = False) -> List[Dict[str, Any]]:
+    async def _do_fetch_whirlpools(self) -> Tuple[Dict[str, Any], ...]:
+        """
+        Fetch Whirlpools from upstream and repopulate the cache.
+        
+        Returns:
+            Tuple[Dict]: Whirlpools
+        """
+        # Orca doesn't have a direct API for this, so we need to query the on-chain data
+        # For now, we'll use a simplified approach with mock data
+        # In a real implementation, we'd use Solana RPC calls to get pool data
+        
+        # Mock data for now - would be replaced with actual implementation
+        whirlpools = [
+            {
+                "id": "whirlpool1",
+                "token_a": "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",  # USDC
+                "token_b": "So11111111111111111111111111111111111111112",  # Wrapped SOL
+                "token_a_name": "USDC",
+                "token_b_name": "SOL",
+                "liquidity": 8000000,
+                "volume_24h": 1500000,
+                "fee_rate": 0.003,
+                "price": 22.4,
+                "tick_spacing": 64,
+                "program_id": self.ORCA_WHIRLPOOL_PROGRAM_ID
+            },
+            {
+                "id": "whirlpool2",
+                "token_a": "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",  # USDC
+                "token_b": "Es9vMFrzaCERmJfrF4H2FYD4KCoNkY11McCe8BenwNYB",  # USDT
+                "token_a_name": "USDC",
+                "token_b_name": "USDT",
+                "liquidity": 12000000,
+                "volume_24h": 5000000,
+                "fee_rate": 0.0005,
+                "price": 1.002,
+                "tick_spacing": 1,
+                "program_id": self.ORCA_WHIRLPOOL_PROGRAM_ID
+            }
+        ]
+        
+        # Update cache
+        whirlpools = tuple(whirlpools)
+        self._intern_pool_keys(whirlpools)
+        self._whirlpools_change_rate, self.whirlpools_cache_ttl = self._adapt_ttl(
+            self._wp_by_id, whirlpools, self._whirlpools_change_rate, self.whirlpools_cache_ttl
+        )
+        self.whirlpools_cache = whirlpools
+        self.whirlpools_last_updated = time.time()
+        self._token_to_whirlpools = self._build_token_index(whirlpools)
+        self._wp_by_id = {pool["id"]: pool for pool in whirlpools}
+        self._wp_liq_arr, self._wp_vol_arr, self._token_to_wp_positions = self._build_columns(whirlpools)
+        
+        return whirlpools
+    
+    async def get_all_pools(self, force_refresh: bool = False) -> Tuple[Dict[str, Any], ...]:
         """
         Get all Orca v2 pools (non-concentrated liquidity).
         
@@ -233,7 +615,7 @@ class OrcaClient:
             force_refresh: Force refresh the pools cache
             
         Returns:
-            List[Dict]: List of pools
+            Tuple[Dict]: Pools
         """
         now = time.time()
         
@@ -243,43 +625,13 @@ class OrcaClient:
             now - self.pools_last_updated < self.pools_cache_ttl):
             return self.pools_cache
         
+        # Join an in-flight refresh rather than starting a duplicate fetch
+        if self._pools_inflight is None:
+            self._pools_inflight = asyncio.ensure_future(self._do_fetch_pools())
+            self._pools_inflight.add_done_callback(self._clear_pools_inflight)
+        
         try:
-            # Mock data for v2 pools
-            pools = [
-                {
-                    "id": "poolv2_1",
-                    "token_a": "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",  # USDC
-                    "token_b": "So11111111111111111111111111111111111111112",  # Wrapped SOL
-                    "lp_token": "lp_token_address_orca1",
-                    "token_a_name": "USDC",
-                    "token_b_name": "SOL",
-                    "liquidity": 2000000,
-                    "volume_24h": 400000,
-                    "fee_rate": 0.0025,
-                    "price": 22.5,
-                    "program_id": self.ORCA_V2_PROGRAM_ID
-                },
-                {
-                    "id": "poolv2_2",
-                    "token_a": "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",  # USDC
-                    "token_b": "mSoLzYCxHdYgdzU16g5QSh3i5K3z3KZK7ytfqcJm7So",  # mSOL
-                    "lp_token": "lp_token_address_orca2",
-                    "token_a_name": "USDC",
-                    "token_b_name": "mSOL",
-                    "liquidity": 1500000,
-                    "volume_24h": 250000,
-                    "fee_rate": 0.0025,
-                    "price": 23.0,
-                    "program_id": self.ORCA_V2_PROGRAM_ID
-                }
-            ]
-            
-            # Update cache
-            self.pools_cache = pools
-            self.pools_last_updated = now
-            
-            return pools
-            
+            return await asyncio.shield(self._pools_inflight)
         except Exception as e:
             logger.error(f"Error getting Orca v2 pools: {e}", exc_info=True)
             
@@ -290,7 +642,58 @@ class OrcaClient:
                 
             raise OrcaClientError(f"Failed to get pools: {e}")
     
-    async def find_pools_for_token(self, token_address: str) -> Dict[str, List[Dict[str, Any]]]:
+    async def _do_fetch_pools(self) -> Tuple[Dict[str, Any], ...]:
+        """
+        Fetch v2 pools from upstream and repopulate the cache.
+        
+        Returns:
+            Tuple[Dict]: v2 pools
+        """
+        # Mock data for v2 pools
+        pools = [
+            {
+                "id": "poolv2_1",
+                "token_a": "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",  # USDC
+                "token_b": "So11111111111111111111111111111111111111112",  # Wrapped SOL
+                "lp_token": "lp_token_address_orca1",
+                "token_a_name": "USDC",
+                "token_b_name": "SOL",
+                "liquidity": 2000000,
+                "volume_24h": 400000,
+                "fee_rate": 0.0025,
+                "price": 22.5,
+                "program_id": self.ORCA_V2_PROGRAM_ID
+            },
+            {
+                "id": "poolv2_2",
+                "token_a": "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",  # USDC
+                "token_b": "mSoLzYCxHdYgdzU16g5QSh3i5K3z3KZK7ytfqcJm7So",  # mSOL
+                "lp_token": "lp_token_address_orca2",
+                "token_a_name": "USDC",
+                "token_b_name": "mSOL",
+                "liquidity": 1500000,
+                "volume_24h": 250000,
+                "fee_rate": 0.0025,
+                "price": 23.0,
+                "program_id": self.ORCA_V2_PROGRAM_ID
+            }
+        ]
+        
+        # Update cache
+        pools = tuple(pools)
+        self._intern_pool_keys(pools)
+        self._pools_change_rate, self.pools_cache_ttl = self._adapt_ttl(
+            self._pools_by_id, pools, self._pools_change_rate, self.pools_cache_ttl
+        )
+        self.pools_cache = pools
+        self.pools_last_updated = time.time()
+        self._token_to_v2_pools = self._build_token_index(pools)
+        self._pools_by_id = {pool["id"]: pool for pool in pools}
+        self._v2_liq_arr, self._v2_vol_arr, self._token_to_v2_positions = self._build_columns(pools)
+        
+        return pools
+    
+    async def find_pools_for_token(self, token_address: str) -> Dict[str, Tuple[Dict[str, Any], ...]]:
         """
         Find all pools (both v2 and whirlpools) for a specific token.
         
@@ -298,35 +701,69 @@ class OrcaClient:
             token_address: Token mint address
             
         Returns:
-            Dict: Dictionary with 'v2_pools' and 'whirlpools' lists
+            Dict: Dictionary with 'v2_pools' and 'whirlpools' tuples
         """
+        token_address = sys.intern(token_address)
         try:
-            v2_pools = await self.get_all_pools()
-            whirlpools = await self.get_all_whirlpools()
-            
-            # Find pools where the token is either token A or token B
-            token_v2_pools = [
-                pool for pool in v2_pools
-                if pool["token_a"] == token_address or pool["token_b"] == token_address
-            ]
-            
-            token_whirlpools = [
-                pool for pool in whirlpools
-                if pool["token_a"] == token_address or pool["token_b"] == token_address
-            ]
+            # Refresh caches (and their token indexes) if stale
+            await self.get_all_pools()
+            await self.get_all_whirlpools()
             
+            # Index buckets are immutable tuples, so they can be shared without copying
             return {
-                "v2_pools": token_v2_pools,
-                "whirlpools": token_whirlpools
+                "v2_pools": self._token_to_v2_pools.get(token_address, ()),
+                "whirlpools": self._token_to_whirlpools.get(token_address, ())
             }
             
         except Exception as e:
             logger.error(f"Error finding pools for token {token_address}: {e}", exc_info=True)
             return {
-                "v2_pools": [],
-                "whirlpools": []
+                "v2_pools": (),
+                "whirlpools": ()
             }
     
+    def _compute_impacts_vectorized(self, pool: Dict[str, Any], token_address: str,
+                                    amounts: List[float], pool_type: str) -> List[PriceImpact]:
+        """
+        Calculate price impact for several trade sizes against one pool.
+        
+        Args:
+            pool: Pool data
+            token_address: Token address being traded
+            amounts: Trade amounts in USD
+            pool_type: 'whirlpool' or 'v2'
+            
+        Returns:
+            List[PriceImpact]: Price impact information, one entry per amount
+        """
+        liquidity = pool["liquidity"]
+        amounts_arr = np.asarray(amounts, dtype=np.float64)
+        if liquidity <= 0:
+            impact_arr = np.full(amounts_arr.shape, 100.0)
+        else:
+            # Whirlpools have concentrated liquidity, so impact depends on price range.
+            # This is a simplified model: concentrated liquidity typically has lower
+            # impact for the same TVL. Regular v2 pools follow standard AMM curve
+            depth = liquidity * 2 if pool_type == "whirlpool" else liquidity
+            impact_arr = np.minimum(amounts_arr / depth * 100, 100.0)
+        # Estimate slippage as slightly higher than impact
+        slippage_arr = impact_arr * 1.5
+        
+        pool_id = pool["id"]
+        return [
+            PriceImpact(
+                pool_id=pool_id,
+                token_address=token_address,
+                amount_usd=amount_usd,
+                liquidity_usd=liquidity,
+                pool_type=pool_type,
+                price_impact_percent=impact_percent,
+                slippage_percent=slippage_percent
+            )
+            for amount_usd, impact_percent, slippage_percent
+            in zip(amounts, impact_arr.tolist(), slippage_arr.tolist())
+        ]
+    
     async def calculate_price_impact(self, pool_id: str, token_address: str, amount_usd: float, 
                                   pool_type: str = "whirlpool") -> Dict[str, Any]:
         """
@@ -342,13 +779,18 @@ class OrcaClient:
             Dict: Price impact information
         """
         try:
-            # Get the pool data based on type
+            # Get the pool data based on type, only awaiting a refresh when the
+            # in-memory cache can't answer
             if pool_type == "whirlpool":
-                pools = await self.get_all_whirlpools()
-                pool = next((p for p in pools if p["id"] == pool_id), None)
+                pool = self._wp_by_id.get(pool_id)
+                if pool is None or not self._pools_cache_fresh(pool_type):
+                    await self.get_all_whirlpools()
+                    pool = self._wp_by_id.get(pool_id)
             else:
-                pools = await self.get_all_pools()
-                pool = next((p for p in pools if p["id"] == pool_id), None)
+                pool = self._pools_by_id.get(pool_id)
+                if pool is None or not self._pools_cache_fresh(pool_type):
+                    await self.get_all_pools()
+                    pool = self._pools_by_id.get(pool_id)
             
             if not pool:
                 return {
@@ -356,33 +798,7 @@ class OrcaClient:
                     "error": f"Pool not found: {pool_id}"
                 }
             
-            # Different impact calculations for different pool types
-            if pool_type == "whirlpool":
-                # Whirlpools have concentrated liquidity, so impact depends on price range
-                # This is a simplified model
-                liquidity = pool["liquidity"]
-                if liquidity > 0:
-                    # Concentrated liquidity typically has lower impact for same TVL
-                    impact_percent = min((amount_usd / (liquidity * 2)) * 100, 100)
-                else:
-                    impact_percent = 100
-            else:
-                # Regular v2 pools follow standard AMM curve
-                liquidity = pool["liquidity"]
-                if liquidity > 0:
-                    impact_percent = min((amount_usd / liquidity) * 100, 100)
-                else:
-                    impact_percent = 100
-            
-            return {
-                "pool_id": pool_id,
-                "token_address": token_address,
-                "amount_usd": amount_usd,
-                "liquidity_usd": pool["liquidity"],
-                "pool_type": pool_type,
-                "price_impact_percent": impact_percent,
-                "slippage_percent": impact_percent * 1.5  # Estimate slippage as slightly higher than impact
-            }
+            return asdict(self._compute_impacts_vectorized(pool, token_address, [amount_usd], pool_type)[0])
             
         except Exception as e:
             logger.error(f"Error calculating price impact for pool {pool_id}: {e}", exc_info=True)
@@ -401,6 +817,7 @@ class OrcaClient:
         Returns:
             Dict: Token liquidity data
         """
+        token_address = sys.intern(token_address)
         try:
             pools = await self.find_pools_for_token(token_address)
             v2_pools = pools["v2_pools"]
@@ -419,46 +836,44 @@ class OrcaClient:
                     "source": "orca"
                 }
             
-            # Calculate total liquidity and volume
-            total_v2_liquidity = sum(pool["liquidity"] for pool in v2_pools)
-            total_whirlpool_liquidity = sum(pool["liquidity"] for pool in whirlpools)
-            total_liquidity = total_v2_liquidity + total_whirlpool_liquidity
+            # Aggregate over the columnar views; positions are in the same order
+            # as the pool lists returned by find_pools_for_token
+            v2_liq = self._v2_liq_arr[self._token_to_v2_positions.get(token_address, _NO_POSITIONS)]
+            v2_vol = self._v2_vol_arr[self._token_to_v2_positions.get(token_address, _NO_POSITIONS)]
+            wp_liq = self._wp_liq_arr[self._token_to_wp_positions.get(token_address, _NO_POSITIONS)]
+            wp_vol = self._wp_vol_arr[self._token_to_wp_positions.get(token_address, _NO_POSITIONS)]
             
-            total_v2_volume = sum(pool["volume_24h"] for pool in v2_pools)
-            total_whirlpool_volume = sum(pool["volume_24h"] for pool in whirlpools)
+            total_v2_liquidity, total_v2_volume, max_v2_liquidity, v2_idx = aggregate_pools(v2_liq, v2_vol)
+            total_whirlpool_liquidity, total_whirlpool_volume, max_wp_liquidity, wp_idx = aggregate_pools(wp_liq, wp_vol)
+            total_liquidity = total_v2_liquidity + total_whirlpool_liquidity
             total_volume = total_v2_volume + total_whirlpool_volume
             
-            # Calculate price impact for different trade sizes
-            impact_samples = []
+            # Find the largest pool (v2 wins ties, matching list order)
+            largest_pool = None
+            largest_pool_type = None
+            largest_pool_liquidity = 0.0
+            if v2_idx >= 0:
+                largest_pool, largest_pool_type, largest_pool_liquidity = v2_pools[v2_idx], "v2", max_v2_liquidity
+            if wp_idx >= 0 and (largest_pool is None or max_wp_liquidity > largest_pool_liquidity):
+                largest_pool, largest_pool_type, largest_pool_liquidity = whirlpools[wp_idx], "whirlpool", max_wp_liquidity
             
-            # Use the largest pool for samples
-            if all_pools:
-                largest_pool = max(all_pools, key=lambda p: p["liquidity"])
-                pool_type = "whirlpool" if largest_pool.get("tick_spacing") is not None else "v2"
-                
-                for amount in [100, 1000, 10000, 100000]:
-                    impact = await self.calculate_price_impact(
-                        largest_pool["id"], 
-                        token_address, 
-                        amount, 
-                        pool_type
-                    )
-                    impact_samples.append({
-                        "amount_usd": amount,
-                        "price_impact_percent": impact["price_impact_percent"],
-                        "slippage_percent": impact.get("slippage_percent", impact["price_impact_percent"] * 1.5)
-                    })
+            # Calculate price impact for different trade sizes, using the largest pool
+            impact_samples = []
+            impacts = self._compute_impacts_vectorized(
+                largest_pool,
+                token_address,
+                [100, 1000, 10000, 100000],
+                largest_pool_type
+            )
+            for impact in impacts:
+                impact_samples.append({
+                    "amount_usd": impact.amount_usd,
+                    "price_impact_percent": impact.price_impact_percent,
+                    "slippage_percent": impact.slippage_percent
+                })
             
             # Analyze liquidity concentration
-            if total_liquidity > 0:
-                # Find largest pool by liquidity
-                if all_pools:
-                    largest_pool_liquidity = max(pool["liquidity"] for pool in all_pools)
-                    concentration = largest_pool_liquidity / total_liquidity
-                else:
-                    concentration = 0
-            else:
-                concentration = 0
+            concentration = largest_pool_liquidity / total_liquidity if total_liquidity > 0 else 0
             
             # Check for concentrated liquidity
             concentrated_liquidity_ratio = 0
@@ -6,16 +6,51 @@ import logging
 import time
 import json
 import asyncio
+import random
+import sys
+import functools
+from collections import OrderedDict
 from typing import Dict, List, Any, Optional, Union, Tuple
 import aiohttp
-from datetime import datetime
+import numpy as np
+from yarl import URL
+from dataclasses import dataclass, asdict
+from email.utils import parsedate_to_datetime
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:  # pragma: no cover - optional dependency
+    _json_loads = json.loads
+    _json_dumps = json.dumps
 
 from config.config import config
-from src.utils.circuit_breaker import circuit_breaker
+from src.utils.circuit_breaker import CircuitState, circuit_breaker_registry
 from src.blockchain.solana_client import solana_client, SolanaClientError
 
 logger = logging.getLogger(__name__)
 
+_ALLOWED_METHODS = frozenset({"GET", "POST"})
+
+
+@functools.lru_cache(maxsize=256)
+def _endpoint_url(base: str, endpoint: str) -> URL:
+    """Join the API base URL and an endpoint path into a parsed URL."""
+    return URL(f"{base}/{endpoint.lstrip('/')}")
+
+
+@dataclass(slots=True)
+class SlippageResult:
+    """Slippage of a single trade size against a pool."""
+    pool_id: str
+    token_address: str
+    amount_usd: float
+    liquidity_usd: float
+    slippage_percent: float
+    price_impact: float
+
+
 # Custom exceptions
 class RaydiumClientError(Exception):
     """Base exception for Raydium client errors."""
@@ -25,6 +60,65 @@ class RaydiumRateLimitError(RaydiumClientError):
     """Exception raised when rate limit is exceeded."""
     pass
 
+class TokenBucket:
+    """Async token bucket that makes callers wait for capacity instead of failing."""
+    
+    def __init__(self, capacity: float, refill_rate: float, min_rate: float = 0.1,
+                 decrease_factor: float = 0.5, increase_step: float = 0.05):
+        """
+        Initialize the token bucket.
+        
+        Args:
+            capacity: Maximum number of tokens (burst size)
+            refill_rate: Tokens added per second, also the ceiling for adaptive increases
+            min_rate: Floor for the refill rate after repeated decreases
+            decrease_factor: Multiplier applied to the refill rate on throttling
+            increase_step: Amount added to the refill rate on success
+        """
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.refill_rate = refill_rate
+        self.max_rate = refill_rate
+        self.min_rate = min_rate
+        self.decrease_factor = decrease_factor
+        self.increase_step = increase_step
+        self.last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    def _refill(self) -> None:
+        """Add tokens for the time elapsed since the last refill."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_rate)
+        self.last_refill = now
+    
+    async def acquire(self, n: float = 1) -> None:
+        """
+        Wait until n tokens are available and take them.
+        
+        Args:
+            n: Number of tokens to take
+        """
+        async with self._lock:
+            self._refill()
+            while self.tokens < n:
+                await asyncio.sleep((n - self.tokens) / self.refill_rate)
+                self._refill()
+            self.tokens -= n
+    
+    def decrease(self) -> None:
+        """Multiplicatively slow the refill rate after an upstream 429."""
+        self._refill()
+        self.refill_rate = max(self.min_rate, self.refill_rate * self.decrease_factor)
+        # Drop burst credit so concurrent callers back off together
+        self.tokens = min(self.tokens, 0.0)
+    
+    def increase(self) -> None:
+        """Additively recover the refill rate after a successful request."""
+        if self.refill_rate < self.max_rate:
+            self._refill()
+            self.refill_rate = min(self.max_rate, self.refill_rate + self.increase_step)
+
+
 class RaydiumClient:
     """Client for interacting with Raydium DEX API and on-chain data."""
     
@@ -32,37 +126,138 @@ class RaydiumClient:
     RAYDIUM_AMM_PROGRAM_ID = "675kPX9MHTjS2zt1qfr1NYHuzeLXfQM9H24wFSUt1Mp8"
     RAYDIUM_LP_V4_PROGRAM_ID = "3u8hJUVTA4jH1wYAyUur7FFZVQ8H635K3tSHHF4ssjQ5"
     
+    # Trade sizes (USD) sampled for token liquidity summaries
+    SLIPPAGE_SAMPLE_AMOUNTS = (100, 1000, 10000, 100000)
+    
     def __init__(self):
         """Initialize the Raydium client."""
         self.api_url = config.get("dex", {}).get("raydium", {}).get("api_url", "https://api.raydium.io")
         self.session = None
-        self.request_count = 0
-        self.last_reset = time.time()
+        # Breaker is checked inline in _make_request rather than via a decorator
+        self._breaker = circuit_breaker_registry.get_or_create("raydium_api", failure_threshold=5, timeout=60.0)
         self.rate_limit = 60  # Default rate limit per minute
+        self._bucket = TokenBucket(self.rate_limit, self.rate_limit / 60.0)
+        # Cap concurrent in-flight HTTP calls (separate from the quota above)
+        self.max_concurrency = config.get("dex", {}).get("raydium", {}).get("max_concurrency", 20)
+        self._sem = asyncio.Semaphore(self.max_concurrency)
         self.max_retries = 3
         self.retry_delay = 1.0
+        self.retry_cap = 30.0
         self.initialized = False
+        self._init_lock = asyncio.Lock()
+        
+        # Connection pooling: one warm keep-alive pool shared by all requests
+        self._connector_kwargs = {
+            "limit": 100,
+            "limit_per_host": 20,
+            "ttl_dns_cache": 300,
+            "keepalive_timeout": 75,
+            "enable_cleanup_closed": True
+        }
         
         # Pool cache
         self.pools_cache = {}
-        self.pools_last_updated = 0
+        self.pools_last_updated = float("-inf")  # Monotonic; -inf means never fetched
         self.pools_cache_ttl = 300  # 5 minutes
+        self.pools_stale_ttl = 3600  # Serve stale data while refreshing for up to 1 hour
+        
+        # Lookup indexes rebuilt on every cache refresh
+        self._pools_by_token: Dict[str, List[Dict[str, Any]]] = {}
+        self._pools_by_id: Dict[str, Dict[str, Any]] = {}
+        
+        # Columnar (SoA) view of the cache for large per-token aggregates; token
+        # positions index into it in the same order as _pools_by_token buckets
+        self._pools_np = np.empty(0, dtype=[("liq", "f8"), ("vol", "f8")])
+        self._pool_positions_by_token: Dict[str, np.ndarray] = {}
+        self.numpy_min_pools = 64  # Below this, a plain Python pass is faster
+        
+        # Derived per-token liquidity summaries (LRU + TTL); entries from an
+        # older pool generation are treated as misses
+        self._pools_generation = 0
+        self._token_liq_cache: OrderedDict[str, Tuple[float, int, Dict[str, Any]]] = OrderedDict()
+        self._token_liq_ttl = 60  # 1 minute
+        self._token_liq_max = 2048
+        
+        # In-flight refresh shared by concurrent callers (single-flight)
+        self._pools_inflight: Optional[asyncio.Future] = None
     
     async def initialize(self):
         """Initialize the client session."""
-        if not self.initialized:
-            self.session = aiohttp.ClientSession()
+        if self.initialized:
+            return
+        
+        async with self._init_lock:
+            if self.initialized:
+                return
+            
+            connector = aiohttp.TCPConnector(**self._connector_kwargs)
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=15, connect=5),
+                headers={"Content-Type": "application/json"}
+            )
             self.initialized = True
             logger.info("Raydium client initialized")
     
     async def close(self):
         """Close the client session."""
-        if self.session and not self.session.closed:
-            await self.session.close()
+        async with self._init_lock:
+            session, self.session = self.session, None
             self.initialized = False
-            logger.info("Raydium client closed")
+            if session and not session.closed:
+                await session.close()
+                logger.info("Raydium client closed")
+    
+    async def __aenter__(self) -> "RaydiumClient":
+        """Initialize the client for use as an async context manager."""
+        await self.initialize()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        """Close the client session on context exit."""
+        await self.close()
+    
+    @staticmethod
+    def _retry_after(headers: Optional[Any]) -> Optional[float]:
+        """
+        Parse a Retry-After header into a delay in seconds.
+        
+        Args:
+            headers: Response headers (may be None)
+            
+        Returns:
+            Optional[float]: Delay in seconds, or None if absent or unparseable
+        """
+        value = headers.get("Retry-After") if headers else None
+        if not value:
+            return None
+        
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        
+        try:
+            return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+        except (TypeError, ValueError):
+            return None
+    
+    def _backoff_delay(self, retries: int, retry_after: Optional[float] = None) -> float:
+        """
+        Compute a full-jitter exponential backoff delay.
+        
+        Args:
+            retries: Retry attempt number
+            retry_after: Server-provided minimum delay, if any; clamped to retry_cap
+            
+        Returns:
+            float: Delay in seconds, at most retry_cap
+        """
+        delay = random.uniform(0, min(self.retry_cap, self.retry_delay * (2 ** retries)))
+        if retry_after is not None:
+            # Never let a hostile or buggy Retry-After stall the caller
+            delay = max(delay, min(retry_after, self.retry_cap))
+        return delay
     
-    @circuit_breaker("raydium_api", failure_threshold=5, timeout=60.0)
     async def _make_request(self, endpoint: str, method: str = "GET", 
                             params: Dict[str, Any] = None, data: Dict = None) -> Dict[str, Any]:
         """
@@ -79,81 +274,101 @@ class RaydiumClient:
             
         Raises:
             RaydiumClientError: On request failure
-            RaydiumRateLimitError: When rate limited
-        """
-        if not self.initialized:
-            await self.initialize()
-        
-        # Check rate limiting
-        now = time.time()
-        if now - self.last_reset > 60:
-            self.request_count = 0
-            self.last_reset = now
-        
-        self.request_count += 1
-        
-        # Apply rate limiting
-        if self.request_count > self.rate_limit:
-            delay = 60 - (now - self.last_reset)
-            if delay > 0:
-                raise RaydiumRateLimitError(f"Rate limit exceeded. Try again in {delay:.2f} seconds")
-        
-        url = f"{self.api_url}/{endpoint.lstrip('/')}"
-        headers = {"Content-Type": "application/json"}
-        
-        retries = 0
-        while retries <= self.max_retries:
-            try:
-                if method.upper() == "GET":
-                    async with self.session.get(url, params=params, headers=headers) as response:
-                        if response.status == 429:  # Rate limited
-                            retries += 1
-                            delay = self.retry_delay * (2 ** retries)
-                            logger.warning(f"Rate limited by Raydium API. Retrying in {delay:.2f}s")
-                            await asyncio.sleep(delay)
-                            continue
-                        
-                        response.raise_for_status()
-                        return await response.json()
-                        
-                elif method.upper() == "POST":
-                    async with self.session.post(url, params=params, json=data, headers=headers) as response:
-                        if response.status == 429:  # Rate limited
+            CircuitOpenError: If the Raydium circuit breaker is open
+        """
+        method = method.upper()
+        if method not in _ALLOWED_METHODS:
+            raise RaydiumClientError(f"Unsupported HTTP method: {method}")
+        
+        # Returns immediately while the circuit is closed
+        breaker = self._breaker
+        await breaker.before_call()
+        
+        # Every admitted call reports exactly one outcome, or a half-open
+        # probe slot leaks and the breaker rejects calls for good
+        started = time.monotonic()
+        healthy = False
+        failure: Optional[BaseException] = None
+        try:
+            if not self.initialized:
+                await self.initialize()
+            
+            # Shape traffic to the rate limit; waits rather than raising
+            await self._bucket.acquire()
+            
+            # Parsed once per endpoint; aiohttp reuses a URL object without re-parsing
+            url = _endpoint_url(self.api_url, endpoint)
+            body = _json_dumps(data) if data is not None and method == "POST" else None
+            
+            retries = 0
+            while retries <= self.max_retries:
+                try:
+                    async with self._sem:
+                        async with self.session.request(method, url, params=params, data=body) as response:
+                            if response.status != 429:
+                                response.raise_for_status()
+                                self._bucket.increase()
+                                result = _json_loads(await response.read())
+                                healthy = True
+                                return result
+                            
+                            # Rate limited
+                            self._bucket.decrease()
                             retries += 1
-                            delay = self.retry_delay * (2 ** retries)
-                            logger.warning(f"Rate limited by Raydium API. Retrying in {delay:.2f}s")
-                            await asyncio.sleep(delay)
-                            continue
-                        
-                        response.raise_for_status()
-                        return await response.json()
-                
-                else:
-                    raise RaydiumClientError(f"Unsupported HTTP method: {method}")
+                            if retries > self.max_retries:
+                                break
+                            delay = self._backoff_delay(retries, self._retry_after(response.headers))
                     
-            except aiohttp.ClientResponseError as e:
-                if e.status == 429:  # Rate limited
-                    retries += 1
-                    delay = self.retry_delay * (2 ** retries)
+                    # Back off outside the semaphore so the slot is free for others
                     logger.warning(f"Rate limited by Raydium API. Retrying in {delay:.2f}s")
                     await asyncio.sleep(delay)
                     continue
-                
-                logger.error(f"Raydium API error: {e}")
-                raise RaydiumClientError(f"API error: {e}")
-                
-            except aiohttp.ClientError as e:
-                retries += 1
-                if retries <= self.max_retries:
-                    delay = self.retry_delay * (2 ** retries)
-                    logger.warning(f"Raydium API request failed: {e}. Retrying in {delay:.2f}s")
-                    await asyncio.sleep(delay)
-                    continue
-                
-                logger.error(f"Raydium API request failed after {retries} retries: {e}")
-                raise RaydiumClientError(f"Request failed: {e}")
-                
-        raise RaydiumClientError(f"Failed after {self.max_retries} retries")
+                        
+                except aiohttp.ClientResponseError as e:
+                    if e.status == 429:  # Rate limited
+                        self._bucket.decrease()
+                        retries += 1
+                        if retries > self.max_retries:
+                            break
+                        delay = self._backoff_delay(retries, self._retry_after(e.headers))
+                        logger.warning(f"Rate limited by Raydium API. Retrying in {delay:.2f}s")
+                        await asyncio.sleep(delay)
+                        continue
+                    
+                    # Only server-side errors say anything about Raydium's health
+                    healthy = e.status < 500
+                    logger.error(f"Raydium API error: {e}")
+                    raise RaydiumClientError(f"API error: {e}")
+                    
+                except aiohttp.ClientError as e:
+                    retries += 1
+                    if retries <= self.max_retries:
+                        delay = self._backoff_delay(retries)
+                        logger.warning(f"Raydium API request failed: {e}. Retrying in {delay:.2f}s")
+                        await asyncio.sleep(delay)
+                        continue
+                    
+                    logger.error(f"Raydium API request failed after {retries} retries: {e}")
+                    raise RaydiumClientError(f"Request failed: {e}")
+                    
+            raise RaydiumClientError(f"Failed after {self.max_retries} retries")
+        
+        except asyncio.CancelledError as e:
+            # Says nothing about Raydium while closed, but a cancelled probe
+            # must still give up its half-open slot
+            if breaker.state is not CircuitState.CLOSED:
+                failure = e
+            raise
+        except Exception as e:
+            # Timeouts, exhausted 429 retries, bad JSON and init errors included
+            failure = e
+            raise
+        finally:
+            elapsed = time.monotonic() - started
+            if healthy:
+                await breaker.record_success(elapsed)
+            elif failure is not None:
+                await breaker.record_failure(failure, elapsed)
     
     async def get_all_pools(self, force_refresh: bool = False) -> List[Dict[str, Any]]:
         """
@@ -165,59 +380,22 @@ class RaydiumClient:
         Returns:
             List[Dict]: List of liquidity pools
         """
-        now = time.time()
+        age = time.monotonic() - self.pools_last_updated
         
         # Check if we can use cached data
-        if (not force_refresh and 
-            self.pools_cache and 
-            now - self.pools_last_updated < self.pools_cache_ttl):
-            return self.pools_cache
+        if not force_refresh and self.pools_cache:
+            if age < self.pools_cache_ttl:
+                return self.pools_cache
+            
+            # Stale-while-revalidate: serve the stale cache and refresh in the background
+            if age < self.pools_stale_ttl:
+                self._start_pools_refresh()
+                return self.pools_cache
         
         try:
-            # Raydium doesn't have a direct API for this, so we need to query the on-chain data
-            # For now, we'll use a simplified approach with mock data
-            # In a real implementation, we'd use Solana RPC calls to get pool data
-            
-            # Mock data for now - would be replaced with actual implementation
-            pools = [
-                {
-                    "id": "pool1",
-                    "base_token": "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",  # USDC
-                    "quote_token": "So11111111111111111111111111111111111111112",  # Wrapped SOL
-                    "lp_token": "lp_token_address1",
-                    "base_token_name": "USDC",
-                    "quote_token_name": "SOL",
-                    "liquidity": 5000000,
-                    "volume_24h": 1000000,
-                    "fee_rate": 0.25,
-                    "price": 22.5,
-                    "pool_version": "V4",
-                    "program_id": self.RAYDIUM_LP_V4_PROGRAM_ID
-                },
-                {
-                    "id": "pool2",
-                    "base_token": "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",  # USDC
-                    "quote_token": "mSoLzYCxHdYgdzU16g5QSh3i5K3z3KZK7ytfqcJm7So",  # mSOL
-                    "lp_token": "lp_token_address2",
-                    "base_token_name": "USDC",
-                    "quote_token_name": "mSOL",
-                    "liquidity": 3000000,
-                    "volume_24h": 500000,
-                    "fee_rate": 0.25,
-                    "price": 23.1,
-                    "pool_version": "V4",
-                    "program_id": self.RAYDIUM_LP_V4_PROGRAM_ID
-                }
-            ]
-            
-            # Update cache
-            self.pools_cache = pools
-            self.pools_last_updated = now
-            
-            return pools
-            
+            return await asyncio.shield(self._start_pools_refresh())
         except Exception as e:
-            logger.error(f"Error getting Raydium pools: {e}", exc_info=True)
+            logger.error(f"Error getting Raydium pools: {e}", exc_info=logger.isEnabledFor(logging.DEBUG))
             
             # If we have cached data, return it even if expired
             if self.pools_cache:
@@ -226,6 +404,148 @@ class RaydiumClient:
                 
             raise RaydiumClientError(f"Failed to get pools: {e}")
     
+    def _start_pools_refresh(self) -> asyncio.Future:
+        """
+        Start a pool refresh, or join the one already in flight.
+        
+        Returns:
+            asyncio.Future: The in-flight refresh
+        """
+        if self._pools_inflight is None:
+            self._pools_inflight = asyncio.ensure_future(self._do_fetch_pools())
+            self._pools_inflight.add_done_callback(self._clear_pools_inflight)
+        return self._pools_inflight
+    
+    def _clear_pools_inflight(self, future: asyncio.Future) -> None:
+        """Forget the finished pool refresh so the next expiry starts a new one."""
+        self._pools_inflight = None
+        # Background refreshes have no awaiter; surface their failures here
+        if not future.cancelled() and future.exception() is not None:
+            logger.warning(f"Raydium pool refresh failed: {future.exception()}")
+    
+    async def _do_fetch_pools(self) -> List[Dict[str, Any]]:
+        """
+        Fetch pools from upstream and repopulate the cache.
+        
+        Returns:
+            List[Dict]: List of liquidity pools
+        """
+        # Raydium doesn't have a direct API for this, so we need to query the on-chain data
+        # For now, we'll use a simplified approach with mock data
+        # In a real implementation, we'd use Solana RPC calls to get pool data
+        
+        # Mock data for now - would be replaced with actual implementation
+        pools = [
+            {
+                "id": "pool1",
+                "base_token": "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",  # USDC
+                "quote_token": "So11111111111111111111111111111111111111112",  # Wrapped SOL
+                "lp_token": "lp_token_address1",
+                "base_token_name": "USDC",
+                "quote_token_name": "SOL",
+                "liquidity": 5000000,
+                "volume_24h": 1000000,
+                "fee_rate": 0.25,
+                "price": 22.5,
+                "pool_version": "V4",
+                "program_id": self.RAYDIUM_LP_V4_PROGRAM_ID
+            },
+            {
+                "id": "pool2",
+                "base_token": "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",  # USDC
+                "quote_token": "mSoLzYCxHdYgdzU16g5QSh3i5K3z3KZK7ytfqcJm7So",  # mSOL
+                "lp_token": "lp_token_address2",
+                "base_token_name": "USDC",
+                "quote_token_name": "mSOL",
+                "liquidity": 3000000,
+                "volume_24h": 500000,
+                "fee_rate": 0.25,
+                "price": 23.1,
+                "pool_version": "V4",
+                "program_id": self.RAYDIUM_LP_V4_PROGRAM_ID
+            }
+        ]
+        
+        # Update cache
+        self.pools_cache = pools
+        self.pools_last_updated = time.monotonic()
+        self._index_pools(pools)
+        
+        return pools
+    
+    @staticmethod
+    def _intern_pool_keys(pools: List[Dict[str, Any]]) -> None:
+        """
+        Intern the strings repeated across pool records so they share one copy.
+        
+        Args:
+            pools: List of liquidity pools, updated in place
+        """
+        for pool in pools:
+            pool["base_token"] = sys.intern(pool["base_token"])
+            pool["quote_token"] = sys.intern(pool["quote_token"])
+            pool["base_token_name"] = sys.intern(pool["base_token_name"])
+            pool["quote_token_name"] = sys.intern(pool["quote_token_name"])
+            pool["pool_version"] = sys.intern(pool["pool_version"])
+            pool["program_id"] = sys.intern(pool["program_id"])
+    
+    def _index_pools(self, pools: List[Dict[str, Any]]) -> None:
+        """
+        Rebuild the token and id lookup indexes for a fresh pool list.
+        
+        Args:
+            pools: List of liquidity pools
+        """
+        self._intern_pool_keys(pools)
+        
+        by_token: Dict[str, List[Dict[str, Any]]] = {}
+        positions: Dict[str, List[int]] = {}
+        by_id: Dict[str, Dict[str, Any]] = {}
+        for i, pool in enumerate(pools):
+            by_token.setdefault(pool["base_token"], []).append(pool)
+            positions.setdefault(pool["base_token"], []).append(i)
+            if pool["quote_token"] != pool["base_token"]:
+                by_token.setdefault(pool["quote_token"], []).append(pool)
+                positions.setdefault(pool["quote_token"], []).append(i)
+            by_id[pool["id"]] = pool
+        
+        self._pools_by_token = by_token
+        self._pools_by_id = by_id
+        self._pools_generation += 1
+        self._pools_np = np.array(
+            [(pool["liquidity"], pool["volume_24h"]) for pool in pools],
+            dtype=[("liq", "f8"), ("vol", "f8")]
+        )
+        self._pool_positions_by_token = {
+            token: np.array(idx, dtype=np.intp) for token, idx in positions.items()
+        }
+    
+    def _aggregate_pools(self, token_address: str, pools: List[Dict[str, Any]]) -> Tuple[float, float, Dict[str, Any]]:
+        """
+        Compute total liquidity, total volume and the largest pool in one pass.
+        
+        Args:
+            token_address: Token mint address the pools were looked up for
+            pools: Pools for the token, in index order
+            
+        Returns:
+            Tuple: (total liquidity, total volume, largest pool)
+        """
+        positions = self._pool_positions_by_token.get(token_address)
+        if len(pools) >= self.numpy_min_pools and positions is not None and len(positions) == len(pools):
+            arr = self._pools_np[positions]
+            return float(arr["liq"].sum()), float(arr["vol"].sum()), pools[int(arr["liq"].argmax())]
+        
+        total_liquidity = total_volume = 0
+        largest_pool = None
+        for pool in pools:
+            liquidity = pool["liquidity"]
+            total_liquidity += liquidity
+            total_volume += pool["volume_24h"]
+            if largest_pool is None or liquidity > largest_pool["liquidity"]:
+                largest_pool = pool
+        return total_liquidity, total_volume, largest_pool
+    
     async def find_pools_for_token(self, token_address: str) -> List[Dict[str, Any]]:
         """
         Find all liquidity pools for a specific token.
@@ -237,18 +557,14 @@ class RaydiumClient:
             List[Dict]: List of liquidity pools containing the token
         """
         try:
-            all_pools = await self.get_all_pools()
+            # Refresh the cache (and its indexes) if needed
+            await self.get_all_pools()
             
-            # Find pools where the token is either the base or quote token
-            token_pools = [
-                pool for pool in all_pools
-                if pool["base_token"] == token_address or pool["quote_token"] == token_address
-            ]
-            
-            return token_pools
+            # Copy so callers can't mutate the index bucket
+            return list(self._pools_by_token.get(token_address, ()))
             
         except Exception as e:
-            logger.error(f"Error finding pools for token {token_address}: {e}", exc_info=True)
+            logger.error(f"Error finding pools for token {token_address}: {e}", exc_info=logger.isEnabledFor(logging.DEBUG))
             return []
     
     async def get_pool_data(self, pool_id: str) -> Optional[Dict[str, Any]]:
@@ -262,10 +578,10 @@ class RaydiumClient:
             Optional[Dict]: Pool data or None if not found
         """
         try:
-            all_pools = await self.get_all_pools()
+            await self.get_all_pools()
             
             # Find the specific pool
-            pool = next((p for p in all_pools if p["id"] == pool_id), None)
+            pool = self._pools_by_id.get(pool_id)
             
             if not pool:
                 return None
@@ -277,9 +593,40 @@ class RaydiumClient:
             return pool
             
         except Exception as e:
-            logger.error(f"Error getting pool data for {pool_id}: {e}", exc_info=True)
+            logger.error(f"Error getting pool data for {pool_id}: {e}", exc_info=logger.isEnabledFor(logging.DEBUG))
             return None
     
+    def _slippage_pure(self, pool: Dict[str, Any], token_address: str, amount_usd: float) -> SlippageResult:
+        """
+        Calculate slippage for a trade against an already resolved pool.
+        
+        Args:
+            pool: Pool data
+            token_address: Token address being traded
+            amount_usd: Trade amount in USD
+            
+        Returns:
+            SlippageResult: Slippage information
+        """
+        # Simple slippage model for demonstration
+        # In a real implementation, we would use the actual AMM formula
+        
+        liquidity = pool["liquidity"]
+        
+        # Simplified slippage calculation, clamped to 100%
+        # This is just an approximation - real calculation would use the bonding curve
+        # Empty pools divide by a tiny epsilon and saturate at the clamp
+        slippage_percent = min(100.0, amount_usd * 100.0 / max(liquidity, 1e-12))
+        
+        return SlippageResult(
+            pool["id"],
+            token_address,
+            amount_usd,
+            liquidity,
+            slippage_percent,
+            slippage_percent / 2  # Simplified approximation
+        )
+    
     async def calculate_slippage(self, pool_id: str, token_address: str, amount_usd: float) -> Dict[str, Any]:
         """
         Calculate slippage for a trade in a specific pool.
@@ -301,34 +648,34 @@ class RaydiumClient:
                     "error": "Pool not found"
                 }
             
-            # Simple slippage model for demonstration
-            # In a real implementation, we would use the actual AMM formula
-            
-            liquidity = pool["liquidity"]
-            
-            # Simplified slippage calculation
-            # This is just an approximation - real calculation would use the bonding curve
-            if liquidity > 0:
-                slippage_percent = min((amount_usd / liquidity) * 100, 100)
-            else:
-                slippage_percent = 100
-            
-            return {
-                "pool_id": pool_id,
-                "token_address": token_address,
-                "amount_usd": amount_usd,
-                "liquidity_usd": liquidity,
-                "slippage_percent": slippage_percent,
-                "price_impact": slippage_percent / 2  # Simplified approximation
-            }
+            return asdict(self._slippage_pure(pool, token_address, amount_usd))
             
         except Exception as e:
-            logger.error(f"Error calculating slippage for pool {pool_id}: {e}", exc_info=True)
+            logger.error(f"Error calculating slippage for pool {pool_id}: {e}", exc_info=logger.isEnabledFor(logging.DEBUG))
             return {
                 "slippage_percent": 100,
                 "error": str(e)
             }
     
+    @staticmethod
+    def _copy_liquidity_data(data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Copy a cached liquidity summary so callers can't mutate the cached one.
+        
+        The dict and its lists are copied; pool dicts stay shared with the pool cache.
+        
+        Args:
+            data: Cached token liquidity data
+            
+        Returns:
+            Dict: Copy safe to annotate or extend
+        """
+        return {
+            **data,
+            "slippage_samples": [dict(sample) for sample in data["slippage_samples"]],
+            "pools": list(data["pools"])
+        }
+    
     async def get_token_liquidity_data(self, token_address: str) -> Dict[str, Any]:
         """
         Get comprehensive liquidity data for a token.
@@ -339,7 +686,16 @@ class RaydiumClient:
         Returns:
             Dict: Token liquidity data
         """
+        # Monotonic for cache ages; wall-clock only for the returned epoch
+        now = time.monotonic()
         try:
+            cached = self._token_liq_cache.get(token_address)
+            if cached is not None:
+                ts, generation, data = cached
+                if generation == self._pools_generation and now - ts < self._token_liq_ttl:
+                    self._token_liq_cache.move_to_end(token_address)
+                    return self._copy_liquidity_data(data)
+            
             pools = await self.find_pools_for_token(token_address)
             
             if not pools:
@@ -351,29 +707,22 @@ class RaydiumClient:
                     "last_updated": int(time.time())
                 }
             
-            # Calculate total liquidity and volume
-            total_liquidity = sum(pool["liquidity"] for pool in pools)
-            total_volume = sum(pool["volume_24h"] for pool in pools)
-            
-            # Calculate slippage for different trade sizes
-            slippage_samples = []
-            for amount in [100, 1000, 10000, 100000]:
-                # Get slippage for largest pool
-                largest_pool = max(pools, key=lambda p: p["liquidity"])
-                slippage = await self.calculate_slippage(largest_pool["id"], token_address, amount)
-                slippage_samples.append({
+            # Calculate total liquidity and volume, and find the largest pool
+            total_liquidity, total_volume, largest_pool = self._aggregate_pools(token_address, pools)
+            
+            # Calculate slippage for different trade sizes on the largest pool
+            slippage_samples = [
+                {
                     "amount_usd": amount,
-                    "slippage_percent": slippage["slippage_percent"]
-                })
+                    "slippage_percent": self._slippage_pure(largest_pool, token_address, amount).slippage_percent
+                }
+                for amount in self.SLIPPAGE_SAMPLE_AMOUNTS
+            ]
             
             # Analyze concentration
-            if len(pools) > 0:
-                largest_pool_liquidity = max(pool["liquidity"] for pool in pools)
-                concentration = largest_pool_liquidity / total_liquidity if total_liquidity > 0 else 1
-            else:
-                concentration = 0
+            concentration = largest_pool["liquidity"] / total_liquidity if total_liquidity > 0 else 1
             
-            return {
+            result = {
                 "token_address": token_address,
                 "total_liquidity_usd": total_liquidity,
                 "total_volume_24h": total_volume,
@@ -385,8 +734,16 @@ class RaydiumClient:
                 "source": "raydium"
             }
             
+            # Age from when the data was computed, not from before the await
+            self._token_liq_cache[token_address] = (time.monotonic(), self._pools_generation, result)
+            self._token_liq_cache.move_to_end(token_address)
+            while len(self._token_liq_cache) > self._token_liq_max:
+                self._token_liq_cache.popitem(last=False)
+            
+            return self._copy_liquidity_data(result)
+            
         except Exception as e:
-            logger.error(f"Error getting token liquidity data for {token_address}: {e}", exc_info=True)
+            logger.error(f"Error getting token liquidity data for {token_address}: {e}", exc_info=logger.isEnabledFor(logging.DEBUG))
             return {
                 "token_address": token_address,
                 "total_liquidity_usd": 0,
@@ -5,28 +5,190 @@ Analyzes liquidity patterns and contract features to identify potential rugpull
 import logging
 import time
 import asyncio
-from typing import Dict, List, Any, Optional, Union, Tuple
+import numpy as np
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Union, Tuple, Iterable
 from datetime import datetime, timedelta
 
 from src.dex.dex_aggregator import dex_aggregator
-from src.dex.liquidity_history_tracker import liquidity_history_tracker
+from src.dex.liquidity_history_tracker import liquidity_history_tracker, LiquiditySeries
 from src.blockchain.solana_client import solana_client, SolanaClientError
 from src.models.risk_level import RiskLevel
 
 logger = logging.getLogger(__name__)
 
+_DROP_ANOMALY_TYPES = frozenset({"drop", "sudden_decrease"})
+_LOW_LIQUIDITY_FACTORS = frozenset({"extremely_low_liquidity", "very_low_liquidity"})
+_CONCENTRATION_FACTORS = frozenset({"extreme_liquidity_concentration", "high_liquidity_concentration"})
+
+
 class RugpullDetector:
     """Detects rugpull risks based on liquidity analysis."""
     
+    # Weight of each risk factor in the overall score
+    RISK_FACTOR_WEIGHTS = {
+        "extremely_low_liquidity": 0.25,
+        "very_low_liquidity": 0.2,
+        "low_liquidity": 0.15,
+        "extreme_liquidity_concentration": 0.25,
+        "high_liquidity_concentration": 0.15,
+        "extremely_low_liquidity_ratio": 0.2,
+        "low_liquidity_ratio": 0.1,
+        "significant_liquidity_decrease": 0.2,
+        "moderate_liquidity_decrease": 0.1,
+        "extreme_liquidity_volatility": 0.15,
+        "high_liquidity_volatility": 0.1,
+        "severe_liquidity_drops": 0.25,
+        "significant_liquidity_drops": 0.15,
+        "pump_and_dump_pattern": 0.3,
+        "potential_pump_and_dump": 0.2
+    }
+    DEFAULT_RISK_WEIGHT = 0.1  # Weight for factors not listed above
+    
+    # Threshold tiers as (threshold, factor, score), most severe first.
+    # "Below" tiers match value < threshold; "above" tiers match value > threshold.
+    LIQUIDITY_TIERS = (  # Total liquidity in USD (below)
+        (5000, "extremely_low_liquidity", 1.0),
+        (20000, "very_low_liquidity", 0.8),
+        (100000, "low_liquidity", 0.5),
+    )
+    CONCENTRATION_TIERS = (  # Overall liquidity concentration (above)
+        (0.95, "extreme_liquidity_concentration", 1.0),
+        (0.8, "high_liquidity_concentration", 0.7),
+    )
+    LIQUIDITY_RATIO_TIERS = (  # Liquidity / market cap (below)
+        (0.02, "extremely_low_liquidity_ratio", 0.9),
+        (0.05, "low_liquidity_ratio", 0.6),
+    )
+    LIQUIDITY_CHANGE_TIERS = (  # Liquidity change percent (below; decreases are negative)
+        (-30, "significant_liquidity_decrease", 0.8),
+        (-15, "moderate_liquidity_decrease", 0.5),
+    )
+    VOLATILITY_TIERS = (  # Liquidity volatility (above)
+        (30, "extreme_liquidity_volatility", 0.8),
+        (15, "high_liquidity_volatility", 0.5),
+    )
+    LIQUIDITY_DROP_TIERS = (  # Average anomaly drop size in percent (above)
+        (40, "severe_liquidity_drops", 0.9),
+        (20, "significant_liquidity_drops", 0.7),
+    )
+    
+    # Column layout for score_batch: one score column per weighted factor, and
+    # the metric column each tier table reads (with whether it matches "above")
+    _BATCH_FACTORS = tuple(RISK_FACTOR_WEIGHTS)
+    _BATCH_FACTOR_INDEX = dict(zip(_BATCH_FACTORS, range(len(_BATCH_FACTORS))))
+    _BATCH_WEIGHTS = np.fromiter(RISK_FACTOR_WEIGHTS.values(), dtype=np.float64, count=len(RISK_FACTOR_WEIGHTS))
+    _BATCH_TIER_COLUMNS = (
+        ("total_liquidity", LIQUIDITY_TIERS, False),
+        ("concentration", CONCENTRATION_TIERS, True),
+        ("liquidity_ratio", LIQUIDITY_RATIO_TIERS, False),
+        ("liquidity_change", LIQUIDITY_CHANGE_TIERS, False),
+        ("volatility", VOLATILITY_TIERS, True),
+        ("avg_drop", LIQUIDITY_DROP_TIERS, True),
+    )
+    
     def __init__(self):
         """Initialize the rugpull detector."""
         self.high_risk_threshold = 0.7  # 70% score is high risk
         self.critical_risk_threshold = 0.85  # 85% score is critical risk
+        
+        # Recent analyses (LRU + TTL) and the analyses currently running, per token
+        self._analysis_cache: OrderedDict[str, Tuple[float, Dict[str, Any]]] = OrderedDict()
+        self._analysis_ttl = 60  # 1 minute
+        self._analysis_cache_max = 4096
+        self._analysis_inflight: Dict[str, asyncio.Future] = {}
     
     async def analyze_rugpull_risk(self, token_address: str) -> Dict[str, Any]:
         """
         Analyze rugpull risk for a token.
         
+        Results are cached briefly, and concurrent callers for the same token
+        share one analysis.
+        
+        Args:
+            token_address: Token mint address
+            
+        Returns:
+            Dict: Rugpull risk analysis
+        """
+        cached = self._analysis_cache.get(token_address)
+        if cached is not None and time.monotonic() - cached[0] < self._analysis_ttl:
+            self._analysis_cache.move_to_end(token_address)
+            return self._copy_analysis(cached[1])
+        
+        inflight = self._analysis_inflight.get(token_address)
+        if inflight is None:
+            inflight = asyncio.ensure_future(self._run_analysis(token_address))
+            self._analysis_inflight[token_address] = inflight
+            inflight.add_done_callback(lambda _future: self._analysis_inflight.pop(token_address, None))
+        
+        # Shield so one caller's cancellation doesn't cancel the shared analysis
+        return self._copy_analysis(await asyncio.shield(inflight))
+    
+    @staticmethod
+    def _copy_analysis(result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Copy a shared analysis result so one caller's edits don't reach the others.
+        
+        The dict and its top-level lists and dicts (risk factors, recommendations,
+        concentration) are copied.
+        
+        Args:
+            result: Cached or in-flight analysis result
+            
+        Returns:
+            Dict: Copy safe to annotate or extend
+        """
+        return {key: value.copy() if isinstance(value, (dict, list)) else value for key, value in result.items()}
+    
+    async def analyze_rugpull_risks(self, token_addresses: Iterable[str],
+                                    max_concurrency: int = 16) -> List[Union[Dict[str, Any], BaseException]]:
+        """
+        Analyze rugpull risk for many tokens concurrently.
+        
+        Args:
+            token_addresses: Token mint addresses
+            max_concurrency: Maximum analyses running at once
+            
+        Returns:
+            List: Rugpull risk analyses (or the raised exception), in input order
+        """
+        sem = asyncio.Semaphore(max_concurrency)
+        
+        async def analyze_one(token_address: str) -> Dict[str, Any]:
+            async with sem:
+                return await self.analyze_rugpull_risk(token_address)
+        
+        return await asyncio.gather(
+            *(analyze_one(token_address) for token_address in token_addresses),
+            return_exceptions=True
+        )
+    
+    async def _run_analysis(self, token_address: str) -> Dict[str, Any]:
+        """
+        Run the rugpull analysis and cache successful results.
+        
+        Args:
+            token_address: Token mint address
+            
+        Returns:
+            Dict: Rugpull risk analysis
+        """
+        result = await self._analyze_rugpull_risk_uncached(token_address)
+        
+        # Error results fall back to a default score; don't pin them in the cache
+        if "error" not in result:
+            self._analysis_cache[token_address] = (time.monotonic(), result)
+            self._analysis_cache.move_to_end(token_address)
+            while len(self._analysis_cache) > self._analysis_cache_max:
+                self._analysis_cache.popitem(last=False)
+        
+        return result
+    
+    async def _analyze_rugpull_risk_uncached(self, token_address: str) -> Dict[str, Any]:
+        """
+        Analyze rugpull risk for a token without consulting the cache.
+        
         Args:
             token_address: Token mint address
             
@@ -34,23 +196,40 @@ class RugpullDetector:
             Dict: Rugpull risk analysis
         """
         try:
-            # Get current liquidity data
-            liquidity_data = await dex_aggregator.get_token_liquidity(token_address, force_refresh=False)
+            # Fetch current liquidity, history, change metrics and anomalies concurrently
+            liquidity_data, historical_series, change_metrics, anomalies = await asyncio.gather(
+                dex_aggregator.get_token_liquidity(token_address, force_refresh=False),
+                liquidity_history_tracker.get_liquidity_series(token_address, days=30),
+                liquidity_history_tracker.get_liquidity_change_metrics(token_address, days=7),
+                liquidity_history_tracker.detect_liquidity_anomalies(token_address, days=30),
+                return_exceptions=True
+            )
             
-            # Get historical liquidity data
-            historical_data = await liquidity_history_tracker.get_liquidity_history(token_address, days=30)
+            # A cancelled fetch is not data; let the cancellation propagate
+            for outcome in (liquidity_data, historical_series, change_metrics, anomalies):
+                if isinstance(outcome, asyncio.CancelledError):
+                    raise outcome
             
-            # Get liquidity change metrics
-            change_metrics = await liquidity_history_tracker.get_liquidity_change_metrics(token_address, days=7)
+            # Current liquidity is required; without it the analysis is meaningless
+            if isinstance(liquidity_data, BaseException):
+                raise liquidity_data
             
-            # Get liquidity anomalies
-            anomalies = await liquidity_history_tracker.detect_liquidity_anomalies(token_address, days=30)
+            # Historical inputs are optional; analyze with what we have
+            if isinstance(historical_series, BaseException):
+                logger.warning("Error getting liquidity history for %s: %s", token_address, historical_series)
+                historical_series = LiquiditySeries.empty()
+            if isinstance(change_metrics, BaseException):
+                logger.warning("Error getting liquidity change metrics for %s: %s", token_address, change_metrics)
+                change_metrics = {}
+            if isinstance(anomalies, BaseException):
+                logger.warning("Error detecting liquidity anomalies for %s: %s", token_address, anomalies)
+                anomalies = {}
             
             # Identify risk factors
             risk_factors = await self._identify_risk_factors(
                 token_address, 
                 liquidity_data, 
-                historical_data, 
+                historical_series, 
                 change_metrics, 
                 anomalies
             )
@@ -83,7 +262,7 @@ class RugpullDetector:
             }
             
         except Exception as e:
-            logger.error(f"Error analyzing rugpull risk for {token_address}: {e}", exc_info=True)
+            logger.error("Error analyzing rugpull risk for %s: %s", token_address, e, exc_info=True)
             return {
                 "token_address": token_address,
                 "risk_score": 0.5,  # Default to medium risk on error
@@ -96,7 +275,7 @@ class RugpullDetector:
         self, 
         token_address: str, 
         liquidity_data: Dict[str, Any], 
-        historical_data: List[Dict[str, Any]], 
+        historical_series: LiquiditySeries, 
         change_metrics: Dict[str, Any], 
         anomalies: Dict[str, Any]
     ) -> Dict[str, float]:
@@ -106,7 +285,7 @@ class RugpullDetector:
         Args:
             token_address: Token mint address
             liquidity_data: Current liquidity data
-            historical_data: Historical liquidity data
+            historical_series: Historical total liquidity, oldest first
             change_metrics: Liquidity change metrics
             anomalies: Detected liquidity anomalies
             
@@ -122,74 +301,67 @@ class RugpullDetector:
         
         # 1. Low liquidity risk
         total_liquidity = liquidity_data.get("total_liquidity_usd", 0)
-        if total_liquidity < 5000:
-            risk_factors["extremely_low_liquidity"] = 1.0
-        elif total_liquidity < 20000:
-            risk_factors["very_low_liquidity"] = 0.8
-        elif total_liquidity < 100000:
-            risk_factors["low_liquidity"] = 0.5
+        tier = self._tier_below(total_liquidity, self.LIQUIDITY_TIERS)
+        if tier:
+            risk_factors[tier[0]] = tier[1]
         
         # 2. Liquidity concentration risk
         concentration = liquidity_data.get("liquidity_concentration", {}).get("overall_concentration", 0)
-        if concentration > 0.95:
-            risk_factors["extreme_liquidity_concentration"] = 1.0
-        elif concentration > 0.8:
-            risk_factors["high_liquidity_concentration"] = 0.7
+        tier = self._tier_above(concentration, self.CONCENTRATION_TIERS)
+        if tier:
+            risk_factors[tier[0]] = tier[1]
         
         # 3. Liquidity/Market Cap ratio risk (if price data is available)
         if liquidity_data.get("price_usd") and "market_cap" in liquidity_data:
             market_cap = liquidity_data.get("market_cap", 0)
             if market_cap > 0:
                 liquidity_ratio = total_liquidity / market_cap
-                if liquidity_ratio < 0.02:  # Less than 2% of market cap in liquidity
-                    risk_factors["extremely_low_liquidity_ratio"] = 0.9
-                elif liquidity_ratio < 0.05:  # Less than 5% of market cap in liquidity
-                    risk_factors["low_liquidity_ratio"] = 0.6
+                tier = self._tier_below(liquidity_ratio, self.LIQUIDITY_RATIO_TIERS)
+                if tier:
+                    risk_factors[tier[0]] = tier[1]
         
         # 4. Recent liquidity changes
         liquidity_change = change_metrics.get("liquidity_change_percent", 0)
-        if liquidity_change < -30:  # More than 30% decrease
-            risk_factors["significant_liquidity_decrease"] = 0.8
-        elif liquidity_change < -15:  # More than 15% decrease
-            risk_factors["moderate_liquidity_decrease"] = 0.5
+        tier = self._tier_below(liquidity_change, self.LIQUIDITY_CHANGE_TIERS)
+        if tier:
+            risk_factors[tier[0]] = tier[1]
         
         # 5. Liquidity volatility
         volatility = change_metrics.get("liquidity_volatility", 0)
-        if volatility > 30:  # Very high volatility
-            risk_factors["extreme_liquidity_volatility"] = 0.8
-        elif volatility > 15:  # High volatility
-            risk_factors["high_liquidity_volatility"] = 0.5
+        tier = self._tier_above(volatility, self.VOLATILITY_TIERS)
+        if tier:
+            risk_factors[tier[0]] = tier[1]
         
         # 6. Recent anomalies
-        recent_anomalies = anomalies.get("anomalies", [])
-        drop_anomalies = [a for a in recent_anomalies if a.get("type") in ["drop", "sudden_decrease"]]
-        if drop_anomalies:
-            # Calculate the average size of drops
-            avg_drop = sum(abs(a.get("percent_change", 0)) for a in drop_anomalies) / len(drop_anomalies)
-            if avg_drop > 40:
-                risk_factors["severe_liquidity_drops"] = 0.9
-            elif avg_drop > 20:
-                risk_factors["significant_liquidity_drops"] = 0.7
+        # Average size of drops, accumulated in one pass
+        drop_count = 0
+        drop_total = 0.0
+        for anomaly in anomalies.get("anomalies", []):
+            if anomaly.get("type") in _DROP_ANOMALY_TYPES:
+                drop_total += abs(anomaly.get("percent_change", 0))
+                drop_count += 1
+        if drop_count:
+            avg_drop = drop_total / drop_count
+            tier = self._tier_above(avg_drop, self.LIQUIDITY_DROP_TIERS)
+            if tier:
+                risk_factors[tier[0]] = tier[1]
         
         # 7. Check for classic rugpull pattern: rapid rise followed by drop
-        if historical_data and len(historical_data) >= 14:  # At least two weeks of data
-            historical_data.sort(key=lambda x: x.get("timestamp", 0))
-            
-            # Check for rapid rise followed by drop
-            first_week = historical_data[:7]
-            second_week = historical_data[7:14]
+        if len(historical_series) >= 14:  # At least two weeks of data
+            liquidity = historical_series.liquidity
+            timestamps = historical_series.timestamps
+            if np.any(timestamps[1:] < timestamps[:-1]):
+                # Stored oldest first; reorder (stable, like list.sort) if not
+                liquidity = liquidity[np.argsort(timestamps, kind="stable")]
             
+            # Check for rapid rise followed by drop: week one is days 0-6, week two days 7-13
             first_week_change = 0
-            if first_week[0].get("total_liquidity_usd", 0) > 0:
-                first_week_change = ((first_week[-1].get("total_liquidity_usd", 0) - 
-                                      first_week[0].get("total_liquidity_usd", 0)) / 
-                                     first_week[0].get("total_liquidity_usd", 0)) * 100
+            if liquidity[0] > 0:
+                first_week_change = (liquidity[6] - liquidity[0]) / liquidity[0] * 100
             
             second_week_change = 0
-            if second_week[0].get("total_liquidity_usd", 0) > 0:
-                second_week_change = ((second_week[-1].get("total_liquidity_usd", 0) - 
-                                       second_week[0].get("total_liquidity_usd", 0)) / 
-                                      second_week[0].get("total_liquidity_usd", 0)) * 100
+            if liquidity[7] > 0:
+                second_week_change = (liquidity[13] - liquidity[7]) / liquidity[7] * 100
             
             if first_week_change > 50 and second_week_change < -30:
                 risk_factors["pump_and_dump_pattern"] = 0.9
@@ -206,6 +378,78 @@ class RugpullDetector:
         
         return risk_factors
     
+    @classmethod
+    def score_batch(cls, metrics: Dict[str, Any]) -> np.ndarray:
+        """
+        Score many tokens at once from precomputed metrics.
+        
+        Vectorized equivalent of _identify_risk_factors + _calculate_risk_score
+        for portfolio-wide scans. Accepts anything indexable by column name
+        (dict of arrays, NumPy structured array, DataFrame). Optional columns may
+        be omitted or NaN where the scalar path would skip the check.
+        
+        Args:
+            metrics: Columns total_liquidity, concentration, liquidity_change and
+                volatility, plus optional liquidity_ratio, avg_drop,
+                first_week_change and second_week_change
+            
+        Returns:
+            np.ndarray: Risk score (0-1) per row, aligned with the input
+        """
+        total_liquidity = np.asarray(metrics["total_liquidity"], dtype=np.float64)
+        rows = np.arange(total_liquidity.size)
+        scores = np.zeros((total_liquidity.size, len(cls._BATCH_FACTORS)))
+        
+        # Each tier table contributes at most one factor per row: its first match
+        for column, tiers, above in cls._BATCH_TIER_COLUMNS:
+            try:
+                values = np.asarray(metrics[column], dtype=np.float64)
+            except (KeyError, ValueError):
+                continue
+            thresholds = np.array([tier[0] for tier in tiers], dtype=np.float64)
+            columns = np.array([cls._BATCH_FACTOR_INDEX[tier[1]] for tier in tiers])
+            tier_scores = np.array([tier[2] for tier in tiers])
+            
+            # NaN compares False, so missing metrics match no tier
+            match = values[:, None] > thresholds if above else values[:, None] < thresholds
+            matched = match.any(axis=1)
+            first = match.argmax(axis=1)[matched]
+            scores[rows[matched], columns[first]] = tier_scores[first]
+        
+        # Rapid rise followed by drop
+        try:
+            first_week = np.asarray(metrics["first_week_change"], dtype=np.float64)
+            second_week = np.asarray(metrics["second_week_change"], dtype=np.float64)
+        except (KeyError, ValueError):
+            pass
+        else:
+            pump = (first_week > 50) & (second_week < -30)
+            potential = ~pump & (first_week > 30) & (second_week < -15)
+            scores[pump, cls._BATCH_FACTOR_INDEX["pump_and_dump_pattern"]] = 0.9
+            scores[potential, cls._BATCH_FACTOR_INDEX["potential_pump_and_dump"]] = 0.6
+        
+        # Weighted mean of present factors, as in _calculate_risk_score
+        weighted_sum = scores @ cls._BATCH_WEIGHTS
+        max_possible_sum = (scores > 0) @ cls._BATCH_WEIGHTS
+        risk = np.where(
+            max_possible_sum > 0,
+            np.minimum(1.0, weighted_sum / np.maximum(max_possible_sum, 1e-12)),
+            0.3
+        )
+        
+        # No liquidity is maximum risk
+        return np.where(total_liquidity == 0, 1.0, risk)
+    
+    @staticmethod
+    def _tier_below(value: float, tiers: Tuple[Tuple[float, str, float], ...]) -> Optional[Tuple[str, float]]:
+        """Return (factor, score) of the first tier whose threshold the value is below."""
+        return next(((factor, score) for threshold, factor, score in tiers if value < threshold), None)
+    
+    @staticmethod
+    def _tier_above(value: float, tiers: Tuple[Tuple[float, str, float], ...]) -> Optional[Tuple[str, float]]:
+        """Return (factor, score) of the first tier whose threshold the value is above."""
+        return next(((factor, score) for threshold, factor, score in tiers if value > threshold), None)
+    
     def _calculate_risk_score(self, risk_factors: Dict[str, float]) -> float:
         """
         Calculate overall risk score from risk factors.
@@ -222,28 +466,13 @@ class RugpullDetector:
         if "no_liquidity" in risk_factors:
             return 1.0  # No liquidity is maximum risk
         
-        # Factor weights
-        weights = {
-            "extremely_low_liquidity": 0.25,
-            "very_low_liquidity": 0.2,
-            "low_liquidity": 0.15,
-            "extreme_liquidity_concentration": 0.25,
-            "high_liquidity_concentration": 0.15,
-            "extremely_low_liquidity_ratio": 0.2,
-            "low_liquidity_ratio": 0.1,
-            "significant_liquidity_decrease": 0.2,
-            "moderate_liquidity_decrease": 0.1,
-            "extreme_liquidity_volatility": 0.15,
-            "high_liquidity_volatility": 0.1,
-            "severe_liquidity_drops": 0.25,
-            "significant_liquidity_drops": 0.15,
-            "pump_and_dump_pattern": 0.3,
-            "potential_pump_and_dump": 0.2
-        }
-        
-        # Calculate weighted score
-        weighted_sum = sum(risk_factors[factor] * weights.get(factor, 0.1) for factor in risk_factors)
-        max_possible_sum = sum(weights.get(factor, 0.1) for factor in risk_factors)
+        # Weighted score in a single pass over the factors
+        weights = self.RISK_FACTOR_WEIGHTS
+        weighted_sum = max_possible_sum = 0.0
+        for factor, score in risk_factors.items():
+            weight = weights.get(factor, self.DEFAULT_RISK_WEIGHT)
+            weighted_sum += score * weight
+            max_possible_sum += weight
         
         if max_possible_sum > 0:
             return min(1.0, weighted_sum / max_possible_sum)
@@ -287,31 +516,32 @@ class RugpullDetector:
         
         total_liquidity = liquidity_data.get("total_liquidity_usd", 0)
         
-        explanation = f"This token has ${total_liquidity:,.2f} in total liquidity"
+        # Collect fragments and join once rather than re-copying the string per fragment
+        parts = [f"This token has ${total_liquidity:,.2f} in total liquidity"]
         
         if risk_score >= self.critical_risk_threshold:
-            explanation += " and shows critical rugpull risk indicators."
+            parts.append(" and shows critical rugpull risk indicators.")
         elif risk_score >= self.high_risk_threshold:
-            explanation += " and shows high rugpull risk indicators."
+            parts.append(" and shows high rugpull risk indicators.")
         elif risk_score >= 0.4:
-            explanation += " and shows moderate rugpull risk indicators."
+            parts.append(" and shows moderate rugpull risk indicators.")
         else:
-            explanation += " and shows low rugpull risk indicators."
+            parts.append(" and shows low rugpull risk indicators.")
         
         # Add details about specific risk factors
-        if "extremely_low_liquidity" in risk_factors or "very_low_liquidity" in risk_factors:
-            explanation += " The token has very low liquidity, making it vulnerable to price manipulation and difficult to exit positions."
+        if not risk_factors.keys().isdisjoint(_LOW_LIQUIDITY_FACTORS):
+            parts.append(" The token has very low liquidity, making it vulnerable to price manipulation and difficult to exit positions.")
         
-        if "extreme_liquidity_concentration" in risk_factors or "high_liquidity_concentration" in risk_factors:
-            explanation += " Liquidity is highly concentrated, which increases vulnerability to sudden liquidity removal."
+        if not risk_factors.keys().isdisjoint(_CONCENTRATION_FACTORS):
+            parts.append(" Liquidity is highly concentrated, which increases vulnerability to sudden liquidity removal.")
         
         if "significant_liquidity_decrease" in risk_factors:
-            explanation += " There has been a significant decrease in liquidity recently, which could indicate ongoing liquidity removal."
+            parts.append(" There has been a significant decrease in liquidity recently, which could indicate ongoing liquidity removal.")
         
         if "pump_and_dump_pattern" in risk_factors:
-            explanation += " The token shows a classic pump-and-dump pattern in its liquidity history."
+            parts.append(" The token shows a classic pump-and-dump pattern in its liquidity history.")
         
-        return explanation
+        return "".join(parts)
     
     def _generate_recommendations(self, risk_factors: Dict[str, float], risk_score: float, 
                                 liquidity_data: Dict[str, Any]) -> List[str]:
@@ -342,11 +572,11 @@ class RugpullDetector:
             recommendations.append("Only trade with amounts you can afford to lose completely")
         
         # Add specific recommendations based on risk factors
-        if "extremely_low_liquidity" in risk_factors or "very_low_liquidity" in risk_factors:
+        if not risk_factors.keys().isdisjoint(_LOW_LIQUIDITY_FACTORS):
             recommendations.append("Be aware of high slippage and potential inability to exit positions due to low liquidity")
             recommendations.append("Use small position sizes to minimize slippage impact")
         
-        if "extreme_liquidity_concentration" in risk_factors or "high_liquidity_concentration" in risk_factors:
+        if not risk_factors.keys().isdisjoint(_CONCENTRATION_FACTORS):
             recommendations.append("Monitor for changes in the concentrated liquidity, as removal could happen quickly")
             recommendations.append("Look for tokens with more distributed liquidity pools")
         
@@ -1,8 +1,8 @@
 """
 Utility functions for working with Solana addresses.
 """
-import re
 import logging
+from functools import lru_cache
 from typing import Optional
 
 # Logger
@@ -11,6 +11,33 @@ logger = logging.getLogger(__name__)
 # Regular expression for validating Solana addresses
 SOLANA_ADDRESS_REGEX = r'^[1-9A-HJ-NP-Za-km-z]{32,44}$'
 
+# Well-known program IDs, answered without any validation work
+_KNOWN_PROGRAM_IDS = frozenset({
+    "11111111111111111111111111111111",  # System Program
+    "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA",  # Token Program
+    "TokenzQdBNbLqP5VEhdkAS6EPFLC1PHnBqCXEpPxuEb",  # Token-2022 Program
+    "ATokenGPvbdGVxr1b2hvZbsiqW5xWH25efTNsLJA8knL",  # Associated Token Program
+    "metaqbxxUerdq28cj1RbAWkYQm3ybzjb6a8bt518x1s",  # Metadata Program
+    "MemoSq4gqABAXKb96qnH8TysNcWxMyWCqXgDLGmfcHr",  # Memo Program
+    "ComputeBudget111111111111111111111111111111",  # Compute Budget Program
+    "675kPX9MHTjS2zt1qfr1NYHuzeLXfQM9H24wFSUt1Mp8",  # Raydium AMM Program
+    "3u8hJUVTA4jH1wYAyUur7FFZVQ8H635K3tSHHF4ssjQ5",  # Raydium Liquidity Pool V4
+    "whirLbMiicVdio4qvUfM5KAg6Ct8VwpYzGff3uctyCc",  # Orca Whirlpool
+    "JUP6LkbZbjS1jKKwapdHNy74zcZ3tLUZoi5QNyVTaV4",  # Jupiter Aggregator
+})
+
+# Base58 alphabet as bytes; deleting it from an address leaves only invalid characters
+_BASE58_ALPHABET = b'123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
+
+@lru_cache(maxsize=8192)
+def _validate_cached(address: str) -> bool:
+    """Validate a stripped address; memoized since the same mints recur constantly."""
+    return (
+        32 <= len(address) <= 44
+        and address.isascii()
+        and not address.encode('ascii').translate(None, _BASE58_ALPHABET)
+    )
+
 def validate_solana_address(address: Optional[str]) -> bool:
     """
     Validate if a string is a properly formatted Solana address.
@@ -25,20 +52,9 @@ def validate_solana_address(address: Optional[str]) -> bool:
         return False
     
     # Trim any whitespace
-    address = address.strip()
-    
-    # Check length
-    if len(address) < 32 or len(address) > 44:
-        logger.debug(f"Invalid address length: {len(address)}")
-        return False
-    
-    # Check format using regex
-    if not re.match(SOLANA_ADDRESS_REGEX, address):
-        logger.debug(f"Address failed regex validation: {address}")
-        return False
-    
-    return True
+    return _validate_cached(address.strip())
 
+@lru_cache(maxsize=4096)
 def truncate_address(address: str, start_chars: int = 6, end_chars: int = 4) -> str:
     """
     Truncate an address for display purposes.
@@ -57,6 +73,10 @@ def truncate_address(address: str, start_chars: int = 6, end_chars: int = 4) ->
     if len(address) <= start_chars + end_chars:
         return address
     
+    # Default display width dominates; constant slices skip the generic formatting
+    if start_chars == 6 and end_chars == 4:
+        return address[:6] + "..." + address[-4:]
+    
     return f"{address[:start_chars]}...{address[-end_chars:]}"
 
 def is_program_address(address: str) -> bool:
@@ -70,6 +90,11 @@ def is_program_address(address: str) -> bool:
     Returns:
         bool: True if the address appears to be a program address
     """
-    # Programs typically have specific address patterns
-    # This is a basic check and would need to be improved with actual on-chain checks
-    return validate_solana_address(address) 
\ No newline at end of file
+    # Known programs are answered by a set lookup
+    if address in _KNOWN_PROGRAM_IDS:
+        return True
+    
+    # Otherwise any well-formed address may be a program; this would need to be
+    # improved with actual on-chain checks (the account's executable flag)
+    return validate_solana_address(address)
+ 
\ No newline at end of file
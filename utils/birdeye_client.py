@@ -1,18 +1,98 @@
-import requests
+import asyncio
+import aiohttp
 import logging
+import random
+import types
 from typing import List, Dict, Any
 import os
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # pragma: no cover - optional dependency
+    import json
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
+# Shared read-only stand-in for missing nested objects in API payloads
+_EMPTY = types.MappingProxyType({})
+
+class _BirdeyePriceBatcher:
+    """Coalesce concurrent single-mint price lookups into /defi/multi_price calls."""
+
+    def __init__(self, client: "BirdeyeClient", window: float = 0.01, max_batch: int = 50):
+        """
+        Initialize the batcher.
+
+        Args:
+            client: Client used to issue the batched and fallback requests
+            window: Seconds to collect mints before flushing
+            max_batch: Maximum mints per multi_price request
+        """
+        self._client = client
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: Dict[str, List[asyncio.Future]] = {}
+        self._timer = None
+
+    def fetch(self, mint: str) -> asyncio.Future:
+        """Queue a mint for the next batch and return a future for its price data."""
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._pending.setdefault(mint, []).append(fut)
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return fut
+
+    def _flush(self) -> None:
+        """Send everything collected so far, max_batch mints per request."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, {}
+        mints = list(pending)
+        for i in range(0, len(mints), self.max_batch):
+            asyncio.ensure_future(self._run({mint: pending[mint] for mint in mints[i:i + self.max_batch]}))
+
+    async def _run(self, batch: Dict[str, List[asyncio.Future]]) -> None:
+        """Resolve one batch, falling back to single-mint lookups for misses."""
+        try:
+            prices = await self._client._get_multi_price(list(batch))
+        except Exception as e:
+            logger.warning('Birdeye multi price failed for %d mints: %s', len(batch), e)
+            prices = {}
+
+        missing = [mint for mint in batch if not prices.get(mint)]
+        if missing:
+            fallbacks = await asyncio.gather(*(self._client._fetch_token_price(mint) for mint in missing))
+            prices.update(zip(missing, fallbacks))
+
+        for mint, futures in batch.items():
+            for fut in futures:
+                if not fut.done():
+                    fut.set_result(prices.get(mint) or {})
+
 class BirdeyeClient:
     """Client for Birdeye public API (price/volume history)."""
     BASE_URL = 'https://public-api.birdeye.so'
+    DEXSCREENER_URL = 'https://api.dexscreener.com/latest/dex/tokens'
 
     def __init__(self):
         """Initialize the Birdeye client with API key from environment."""
         self.api_key = os.getenv('BIRDEYE_API_KEY', '')
-        
+        self.session = None
+        self._session_lock = asyncio.Lock()
+        self._price_batcher = _BirdeyePriceBatcher(self)
+        # Cap concurrent Birdeye requests; retry throttling and server errors a few times
+        self._sem = asyncio.Semaphore(int(os.getenv('BIRDEYE_MAX_CONCURRENCY', '8')))
+        self.max_attempts = 3
+        self.attempt_timeout = 3.0
+        # Built once; only sent to Birdeye, never to the DexScreener fallback
+        self._headers = self._get_headers()
+
     def _get_headers(self):
         """Get headers with API key if available."""
         if self.api_key:
@@ -22,55 +102,94 @@ class BirdeyeClient:
             }
         return {}
 
-    def get_token_price(self, mint: str) -> Dict[str, Any]:
-        """Get the current price for a token mint. Uses /defi/price first, then falls back."""
-        headers = self._get_headers()
-        url = f'{self.BASE_URL}/defi/price?address={mint}&chain=solana'
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Lazily create the shared keep-alive session."""
+        if self.session is None or self.session.closed:
+            async with self._session_lock:
+                if self.session is None or self.session.closed:
+                    self.session = aiohttp.ClientSession(
+                        connector=aiohttp.TCPConnector(limit=32, limit_per_host=16, keepalive_timeout=30),
+                        timeout=aiohttp.ClientTimeout(total=10, sock_connect=1.0, sock_read=5.0)
+                    )
+        return self.session
+
+    async def close(self):
+        """Close the shared session."""
+        async with self._session_lock:
+            session, self.session = self.session, None
+            if session and not session.closed:
+                await session.close()
+
+    async def _get_json(self, url: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
+        """GET a Birdeye URL on the shared session and decode the JSON body, retrying transient failures."""
+        session = await self._get_session()
+        for attempt in range(self.max_attempts):
+            try:
+                async with self._sem:
+                    async with asyncio.timeout(self.attempt_timeout):
+                        async with session.get(url, params=params, headers=self._headers) as resp:
+                            resp.raise_for_status()
+                            return _json_loads(await resp.read())
+            except aiohttp.ClientResponseError as e:
+                # Other client errors will never succeed on retry
+                if attempt == self.max_attempts - 1 or (e.status < 500 and e.status != 429):
+                    raise
+            except (asyncio.TimeoutError, aiohttp.ClientConnectionError):
+                if attempt == self.max_attempts - 1:
+                    raise
+            # Back off outside the semaphore so the slot is free for others
+            await asyncio.sleep(0.2 * 2 ** attempt + random.random() * 0.1)
+
+    async def get_token_price(self, mint: str) -> Dict[str, Any]:
+        """Get the current price for a token mint, batched with concurrent lookups."""
+        return await self._price_batcher.fetch(mint)
+
+    async def _get_multi_price(self, mints: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get current prices for several mints in one /defi/multi_price request."""
+        params = {'list_address': ','.join(mints), 'chain': 'solana'}
+        body = await self._get_json(f'{self.BASE_URL}/defi/multi_price', params)
+        data = body.get('data')
+        return data if isinstance(data, dict) else {}
+
+    async def _fetch_token_price(self, mint: str) -> Dict[str, Any]:
+        """Get the current price for a single mint. Uses /defi/price first, then falls back."""
         try:
-            resp = requests.get(url, headers=headers, timeout=10)
-            resp.raise_for_status()
-            data = resp.json().get('data')
+            body = await self._get_json(f'{self.BASE_URL}/defi/price', {'address': mint, 'chain': 'solana'})
+            data = body.get('data')
             if not data or not isinstance(data, dict):
                 # Fallback to legacy endpoint (older API)
-                url_fallback = f'{self.BASE_URL}/public/price?address={mint}'
-                resp2 = requests.get(url_fallback, headers=headers, timeout=10)
-                resp2.raise_for_status()
-                data = resp2.json().get('data') or resp2.json().get('price')
+                body2 = await self._get_json(f'{self.BASE_URL}/public/price', {'address': mint})
+                data = body2.get('data') or body2.get('price')
                 if not data:
-                    logger.warning(f"Birdeye price fallback data for {mint} is empty: {resp2.text}")
+                    logger.warning('Birdeye price fallback data for %s is empty: %s', mint, body2)
                     return {}
                 return data
             return data
         except Exception as e:
-            logger.warning(f'Birdeye token price failed for {mint}: {e}')
+            logger.warning('Birdeye token price failed for %s: %s', mint, e)
             return {}
 
-    def get_price_history(self, mint: str, timeframe: str = '1d') -> List[Dict[str, Any]]:
+    async def get_price_history(self, mint: str, timeframe: str = '1d') -> List[Dict[str, Any]]:
         """Get historical price and volume for a token mint."""
-        headers = self._get_headers()
-        url = f'{self.BASE_URL}/defi/history_price?address={mint}&timeframe={timeframe}&chain=solana'
+        params = {'address': mint, 'timeframe': timeframe, 'chain': 'solana'}
         try:
-            resp = requests.get(url, headers=headers, timeout=10)
-            resp.raise_for_status()
-            return resp.json().get('data', {}).get('items', [])
+            body = await self._get_json(f'{self.BASE_URL}/defi/history_price', params)
+            return body.get('data', {}).get('items', [])
         except Exception as e:
-            logger.warning(f'Birdeye price history failed for {mint}: {e}')
+            logger.warning('Birdeye price history failed for %s: %s', mint, e)
             return []
 
-    def get_markets(self, mint: str) -> List[Dict[str, Any]]:
+    async def get_markets(self, mint: str) -> List[Dict[str, Any]]:
         """Get active markets/pairs for a token including liquidity/volume stats."""
         base_mint = mint[:-4] if mint.endswith('pump') else mint
-        headers = self._get_headers()
-        url = f'{self.BASE_URL}/defi/token_overview?address={base_mint}&chain=solana'
         try:
-            resp = requests.get(url, headers=headers, timeout=10)
-            resp.raise_for_status()
+            body = await self._get_json(f'{self.BASE_URL}/defi/token_overview', {'address': base_mint, 'chain': 'solana'})
             # The new endpoint returns a single object, not a list of markets.
             # We will simulate the old list-based structure for compatibility.
-            data = resp.json().get('data')
+            data = body.get('data')
             if not data or not isinstance(data, dict):
                 return []
-            
+
             return [{
                 'liquidity': data.get('liquidity', 0),
                 'liquidityUsd': data.get('liquidity', 0),
@@ -83,20 +202,26 @@ class BirdeyeClient:
             logger.warning('Birdeye get_markets failed for %s: %s', mint, e)
             # Fallback to DexScreener pairs for liquidity info
             try:
-                ds_url = f'https://api.dexscreener.com/latest/dex/tokens/{base_mint}'
-                ds_resp = requests.get(ds_url, timeout=10)
-                if ds_resp.ok:
-                    pairs = ds_resp.json().get('pairs', [])
-                    return [
-                        {
-                            'dex': p.get('dexId', 'Unknown'),
-                            'marketAddress': p.get('pairAddress', ''),
-                            'quoteSymbol': p.get('quoteSymbol', 'Unknown'),
-                            'liquidityUsd': float(p.get('liquidity', {}).get('usd', 0) or 0),
-                            'volume24hUsd': float(p.get('volume', {}).get('h24', 0) or 0),
-                        }
-                        for p in pairs
-                    ]
+                session = await self._get_session()
+                async with session.get(f'{self.DEXSCREENER_URL}/{base_mint}') as ds_resp:
+                    if ds_resp.ok:
+                        pairs = _json_loads(await ds_resp.read()).get('pairs') or ()
+                        markets = []
+                        for p in pairs:
+                            liquidity = p.get('liquidity') or _EMPTY
+                            volume = p.get('volume') or _EMPTY
+                            markets.append({
+                                'dex': p.get('dexId', 'Unknown'),
+                                'marketAddress': p.get('pairAddress', ''),
+                                'quoteSymbol': p.get('quoteSymbol', 'Unknown'),
+                                'liquidityUsd': float(liquidity.get('usd') or 0.0),
+                                'volume24hUsd': float(volume.get('h24') or 0.0),
+                            })
+                        return markets
             except Exception as _e:
                 logger.debug('DexScreener fallback failed for %s: %s', base_mint, _e)
-            return [] 
\ No newline at end of file
+            return []
+
+
+# Shared client instance
+birdeye_client = BirdeyeClient()
@@ -2,17 +2,35 @@
 Circuit Breaker Pattern Implementation.
 Provides fault tolerance for external service calls.
 """
+from __future__ import annotations
+
 import asyncio
 import logging
 import time
+from array import array
 from enum import Enum
-from typing import Callable, Any, Optional, Dict, TypeVar, Generic, List, Tuple
+from types import MappingProxyType
+from typing import Callable, Any, Iterator, Mapping, Optional, TypeVar
 import functools
 import random
 
 logger = logging.getLogger(__name__)
 
-T = TypeVar("T")
+T = TypeVar("T")  # Static typing only; CircuitBreaker is not generic at runtime
+
+
+@functools.lru_cache(maxsize=256)
+def _cached_is_coroutine_function(func: Callable) -> bool:
+    """Memoized asyncio.iscoroutinefunction for callables that are executed repeatedly."""
+    return asyncio.iscoroutinefunction(func)
+
+
+def _is_coroutine_function(func: Callable) -> bool:
+    """Classify func as async or sync, caching the answer when func is hashable."""
+    try:
+        return _cached_is_coroutine_function(func)
+    except TypeError:
+        return asyncio.iscoroutinefunction(func)
 
 class CircuitState(Enum):
     """Possible states for a circuit breaker."""
@@ -21,7 +39,68 @@ class CircuitState(Enum):
     HALF_OPEN = "half_open"  # Testing if service has recovered
 
 
-class CircuitBreaker(Generic[T]):
+# Internal state codes; plain int compares are cheaper than Enum equality on the hot path
+_STATE_CLOSED = 0
+_STATE_OPEN = 1
+_STATE_HALF_OPEN = 2
+_STATES = (CircuitState.CLOSED, CircuitState.OPEN, CircuitState.HALF_OPEN)
+_STATE_VALUES = tuple(state.value for state in _STATES)
+
+
+class RollingCounter:
+    """
+    Success/failure counts over a sliding time window split into fixed buckets.
+    
+    Buckets are rotated lazily on each record/read, so an idle counter costs nothing.
+    """
+    
+    def __init__(self, buckets: int, bucket_width: float):
+        """
+        Initialize the counter.
+        
+        Args:
+            buckets: Number of buckets in the window
+            bucket_width: Seconds covered by each bucket
+        """
+        self.buckets = buckets
+        self.bucket_width = bucket_width
+        self.successes = array('I', [0] * buckets)
+        self.failures = array('I', [0] * buckets)
+        self._epoch = None  # Absolute index of the current bucket
+    
+    def _advance(self, now: float) -> int:
+        """Rotate past any buckets that expired since the last call and return the current slot."""
+        epoch = int(now // self.bucket_width)
+        if self._epoch is not None and epoch > self._epoch:
+            for i in range(self._epoch + 1, self._epoch + 1 + min(epoch - self._epoch, self.buckets)):
+                slot = i % self.buckets
+                self.successes[slot] = 0
+                self.failures[slot] = 0
+        self._epoch = epoch
+        return epoch % self.buckets
+    
+    def record(self, success: bool, now: float) -> None:
+        """Count one outcome at monotonic time now."""
+        slot = self._advance(now)
+        if success:
+            self.successes[slot] += 1
+        else:
+            self.failures[slot] += 1
+    
+    def totals(self, now: float) -> tuple[int, int]:
+        """Return (successes, failures) within the window ending at now."""
+        self._advance(now)
+        return sum(self.successes), sum(self.failures)
+    
+    def reset(self) -> None:
+        """Clear all buckets."""
+        for slot in range(self.buckets):
+            self.successes[slot] = 0
+            self.failures[slot] = 0
+        self._epoch = None
+
+
+class CircuitBreaker:
     """
     Circuit breaker implementation for fault tolerance.
     
@@ -29,6 +108,23 @@ class CircuitBreaker(Generic[T]):
     graceful degradation when external services are experiencing issues.
     """
     
+    __slots__ = (
+        'name', 'failure_threshold', 'recovery_timeout', 'half_open_max_calls',
+        'half_open_success_threshold', 'timeout', 'exclude_exceptions', '_exclude_exceptions_tuple',
+        'fallback', '_fallback_is_coro', '_state', 'failure_count', 'success_count',
+        'last_failure_time', 'last_state_change_time', 'half_open_calls', '_consecutive_opens',
+        '_open_timeout', 'failure_rate_threshold', 'minimum_throughput', '_window',
+        'total_calls', 'successful_calls', 'failed_calls', 'rejected_calls', 'fallback_calls',
+        '_rt_count', '_rt_mean', '_lock', 'max_concurrent', 'queue_timeout',
+        '_semaphore', '_closed_impl', '_execute_impl', '_stats_dict',
+    )
+    
+    # Weight of each new sample in the moving response-time average,
+    # roughly a 100-call window
+    RESPONSE_TIME_ALPHA = 0.02
+    FAILURE_WINDOW_BUCKETS = 10
+    MAX_RECOVERY_BACKOFF = 32
+    
     def __init__(
         self, 
         name: str,
@@ -37,8 +133,12 @@ class CircuitBreaker(Generic[T]):
         half_open_max_calls: int = 3,
         half_open_success_threshold: int = 2,
         timeout: float = 10.0,
-        exclude_exceptions: List[type] = None,
-        fallback: Optional[Callable[..., T]] = None
+        exclude_exceptions: list[type] = None,
+        fallback: Optional[Callable[..., T]] = None,
+        failure_rate_threshold: Optional[float] = None,
+        minimum_throughput: int = 10,
+        max_concurrent: Optional[int] = None,
+        queue_timeout: Optional[float] = None
     ):
         """
         Initialize a circuit breaker.
@@ -46,12 +146,18 @@ class CircuitBreaker(Generic[T]):
         Args:
             name: Identifier for this circuit breaker
             failure_threshold: Number of consecutive failures before opening circuit
-            recovery_timeout: Seconds to wait before attempting recovery (half-open)
+            recovery_timeout: Seconds to wait before attempting recovery (half-open);
+                doubled for each consecutive re-trip, up to MAX_RECOVERY_BACKOFF times
             half_open_max_calls: Maximum calls allowed in half-open state
             half_open_success_threshold: Successes needed to close circuit
             timeout: Default timeout for operations in seconds
             exclude_exceptions: Exception types that won't count as failures
             fallback: Optional fallback function to call when circuit is open
+            failure_rate_threshold: Failure ratio (0-1) over the last recovery_timeout
+                seconds that opens the circuit; replaces failure_threshold when set
+            minimum_throughput: Calls needed in the window before the rate can trip
+            max_concurrent: Maximum calls in flight at once (bulkhead); unlimited when None
+            queue_timeout: Seconds a call may wait for a free slot; rejected at once when None
         """
         self.name = name
         self.failure_threshold = failure_threshold
@@ -60,15 +166,31 @@ class CircuitBreaker(Generic[T]):
         self.half_open_success_threshold = half_open_success_threshold
         self.timeout = timeout
         self.exclude_exceptions = exclude_exceptions or []
+        # isinstance() against a tuple checks every type in a single C call
+        self._exclude_exceptions_tuple = tuple(self.exclude_exceptions)
         self.fallback = fallback
+        self._fallback_is_coro = asyncio.iscoroutinefunction(fallback) if fallback else False
         
-        # State tracking
-        self.state = CircuitState.CLOSED
+        # State tracking; interval timestamps use time.monotonic()
+        self._state = _STATE_CLOSED
         self.failure_count = 0
         self.success_count = 0
         self.last_failure_time = 0
-        self.last_state_change_time = time.time()
+        self.last_state_change_time = time.monotonic()
         self.half_open_calls = 0
+        # Trips since the circuit was last closed, and the wait they imply
+        self._consecutive_opens = 0
+        self._open_timeout = recovery_timeout
+        
+        # Rate-based tripping over a rolling window, opt-in
+        self.failure_rate_threshold = failure_rate_threshold
+        self.minimum_throughput = minimum_throughput
+        self._window: Optional[RollingCounter] = None
+        if failure_rate_threshold is not None:
+            self._window = RollingCounter(
+                self.FAILURE_WINDOW_BUCKETS,
+                recovery_timeout / self.FAILURE_WINDOW_BUCKETS
+            )
         
         # Stats
         self.total_calls = 0
@@ -76,10 +198,30 @@ class CircuitBreaker(Generic[T]):
         self.failed_calls = 0
         self.rejected_calls = 0
         self.fallback_calls = 0
-        self.response_times: List[float] = []
+        # Streaming response-time average; no samples are stored
+        self._rt_count = 0
+        self._rt_mean = 0.0
         
         # Lock for thread safety
         self._lock = asyncio.Lock()
+        
+        # Bulkhead bounding in-flight calls, opt-in
+        self.max_concurrent = max_concurrent
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(max_concurrent) if max_concurrent else None
+        
+        # execute() dispatches through this; state transitions swap it.
+        # _closed_impl is what runs once a call is admitted.
+        self._closed_impl = self._execute_bulkhead if self._semaphore else self._execute_closed_fast
+        self._execute_impl = self._closed_impl
+        
+        # Reused by get_stats(); only the changing values are rewritten per call
+        self._stats_dict: dict[str, Any] = {"name": name}
+    
+    @property
+    def state(self) -> CircuitState:
+        """Current state as a CircuitState."""
+        return _STATES[self._state]
     
     async def execute(self, func: Callable[..., T], *args, **kwargs) -> T:
         """
@@ -96,184 +238,339 @@ class CircuitBreaker(Generic[T]):
         Raises:
             Exception: If circuit is open and no fallback is provided
         """
-        self.total_calls += 1
-        
+        return await self._execute_impl(func, *args, **kwargs)
+    
+    async def _execute_slow(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """Execute path used while the circuit is OPEN or HALF_OPEN; admits the call, then runs it."""
         # Check if circuit is open
-        if await self._is_open():
+        if self._is_open(time.monotonic()):
+            self.total_calls += 1
             self.rejected_calls += 1
-            logger.warning(f"Circuit {self.name} is open, rejecting call")
+            logger.warning("Circuit %s is open, rejecting call", self.name)
             if self.fallback:
                 self.fallback_calls += 1
                 return await self._call_fallback(*args, **kwargs)
             raise CircuitOpenError(f"Circuit {self.name} is open")
         
         # Handle half-open state
-        if await self._is_half_open():
+        if self._is_half_open():
             if self.half_open_calls >= self.half_open_max_calls:
+                self.total_calls += 1
                 self.rejected_calls += 1
-                logger.warning(f"Circuit {self.name} is half-open and at max calls, rejecting")
+                logger.warning("Circuit %s is half-open and at max calls, rejecting", self.name)
                 if self.fallback:
                     self.fallback_calls += 1
                     return await self._call_fallback(*args, **kwargs)
                 raise CircuitOpenError(f"Circuit {self.name} is half-open and at max calls")
             
-            async with self._lock:
-                self.half_open_calls += 1
+            # No await between the check and the bump, so no lock is needed
+            self.half_open_calls += 1
+        
+        return await self._closed_impl(func, *args, **kwargs)
+    
+    async def _execute_bulkhead(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """Run an admitted call inside the max_concurrent bulkhead, rejecting it when full."""
+        semaphore = self._semaphore
+        if self.queue_timeout:
+            try:
+                async with asyncio.timeout(self.queue_timeout):
+                    await semaphore.acquire()
+                acquired = True
+            except TimeoutError:
+                acquired = False
+        elif semaphore.locked():
+            acquired = False
+        else:
+            # A free slot is taken without suspending
+            await semaphore.acquire()
+            acquired = True
+        
+        if not acquired:
+            self.total_calls += 1
+            self.rejected_calls += 1
+            logger.warning("Circuit %s is at %d concurrent calls, rejecting", self.name, self.max_concurrent)
+            if self.fallback:
+                self.fallback_calls += 1
+                return await self._call_fallback(*args, **kwargs)
+            raise CircuitBulkheadFullError(f"Circuit {self.name} is at {self.max_concurrent} concurrent calls")
         
-        # Execute the function with timing
-        start_time = time.time()
         try:
-            # Add timeout to prevent long-running calls
-            result = await asyncio.wait_for(
-                self._call_function(func, *args, **kwargs),
-                timeout=self.timeout
-            )
+            return await self._execute_closed_fast(func, *args, **kwargs)
+        finally:
+            semaphore.release()
+    
+    async def _execute_closed_fast(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """
+        Execute path used while the circuit is CLOSED; also runs calls admitted by _execute_slow.
+        
+        There is no admission check here. The state is re-read after the call
+        because it may have changed while the call was in flight.
+        """
+        self.total_calls += 1
+        start_time = time.monotonic()
+        try:
+            if not _is_coroutine_function(func):
+                # A sync call cannot be interrupted, so no timeout scope is set up
+                result = func(*args, **kwargs)
+            elif self.timeout is None or self.timeout <= 0:
+                result = await func(*args, **kwargs)
+            else:
+                # Add timeout to prevent long-running calls; unlike wait_for
+                # this cancels the current task instead of wrapping a new one
+                async with asyncio.timeout(self.timeout):
+                    result = await func(*args, **kwargs)
             
             # Record success
-            execution_time = time.time() - start_time
-            await self._record_success(execution_time)
+            now = time.monotonic()
+            execution_time = now - start_time
+            if self._state == _STATE_CLOSED:
+                self._record_success_fast(execution_time, now)
+            else:
+                await self._record_success(execution_time, now)
             return result
             
         except asyncio.TimeoutError:
-            execution_time = time.time() - start_time
-            await self._record_failure(CircuitTimeoutError("Operation timed out"), execution_time)
+            now = time.monotonic()
+            await self._record_failure(CircuitTimeoutError("Operation timed out"), now - start_time, now)
             if self.fallback:
                 self.fallback_calls += 1
                 return await self._call_fallback(*args, **kwargs)
             raise CircuitTimeoutError(f"Operation in circuit {self.name} timed out after {self.timeout}s")
             
         except Exception as e:
-            execution_time = time.time() - start_time
+            now = time.monotonic()
+            execution_time = now - start_time
             # Check if exception should be excluded
-            if any(isinstance(e, exc_type) for exc_type in self.exclude_exceptions):
-                logger.debug(f"Excluded exception in circuit {self.name}: {e}")
+            if self._exclude_exceptions_tuple and isinstance(e, self._exclude_exceptions_tuple):
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Excluded exception in circuit %s: %s", self.name, e)
                 # Don't count excluded exceptions as failures
-                await self._record_success(execution_time)
+                if self._state == _STATE_CLOSED:
+                    self._record_success_fast(execution_time, now)
+                else:
+                    await self._record_success(execution_time, now)
                 raise
                 
-            await self._record_failure(e, execution_time)
+            await self._record_failure(e, execution_time, now)
             if self.fallback:
                 self.fallback_calls += 1
                 return await self._call_fallback(*args, **kwargs)
             raise
     
-    async def _call_function(self, func: Callable[..., T], *args, **kwargs) -> T:
-        """Call the target function, handling both async and sync functions."""
-        if asyncio.iscoroutinefunction(func):
-            return await func(*args, **kwargs)
+    async def before_call(self) -> None:
+        """
+        Admit a call that is guarded manually instead of through execute().
+        
+        Callers report the outcome with record_success() / record_failure().
+        
+        Raises:
+            CircuitOpenError: If the circuit is open or half-open and at max calls
+        """
+        self.total_calls += 1
+        if self._state == _STATE_CLOSED:
+            return
+        
+        if self._is_open():
+            self.rejected_calls += 1
+            raise CircuitOpenError(f"Circuit {self.name} is open")
+        
+        if self._is_half_open():
+            if self.half_open_calls >= self.half_open_max_calls:
+                self.rejected_calls += 1
+                raise CircuitOpenError(f"Circuit {self.name} is half-open and at max calls")
+            
+            self.half_open_calls += 1
+    
+    async def record_success(self, execution_time: float = 0.0) -> None:
+        """Record the success of a manually guarded call."""
+        if self._state == _STATE_CLOSED:
+            self._record_success_fast(execution_time)
         else:
-            return func(*args, **kwargs)
+            await self._record_success(execution_time)
+    
+    async def record_failure(self, exception: Exception, execution_time: float = 0.0) -> None:
+        """Record the failure of a manually guarded call."""
+        await self._record_failure(exception, execution_time)
     
     async def _call_fallback(self, *args, **kwargs) -> T:
         """Call the fallback function if provided."""
         if not self.fallback:
             raise ValueError("No fallback function provided")
             
-        if asyncio.iscoroutinefunction(self.fallback):
+        if self._fallback_is_coro:
             return await self.fallback(*args, **kwargs)
         else:
             return self.fallback(*args, **kwargs)
     
-    async def _is_open(self) -> bool:
-        """Check if circuit is open (blocking requests)."""
-        if self.state == CircuitState.OPEN:
-            # Check if recovery timeout has elapsed
-            if time.time() - self.last_failure_time >= self.recovery_timeout:
-                # Transition to half-open
-                async with self._lock:
-                    if self.state == CircuitState.OPEN:
-                        await self._transition_to_half_open()
-                    return False
+    def _is_open(self, now: Optional[float] = None) -> bool:
+        """
+        Check if circuit is open (blocking requests).
+        
+        The check and the OPEN→HALF_OPEN transition run without suspending,
+        so exactly one caller performs the transition and no lock is needed.
+        
+        Args:
+            now: Current time.monotonic() reading, if the caller already has one
+        """
+        if self._state != _STATE_OPEN:
+            return False
+        if now is None:
+            now = time.monotonic()
+        # Check if recovery timeout has elapsed
+        if now - self.last_failure_time < self._open_timeout:
             return True
+        self._transition_to_half_open()
         return False
     
-    async def _is_half_open(self) -> bool:
+    def _is_half_open(self) -> bool:
         """Check if circuit is half-open (testing recovery)."""
-        return self.state == CircuitState.HALF_OPEN
+        return self._state == _STATE_HALF_OPEN
     
-    async def _record_success(self, execution_time: float) -> None:
+    def _record_response_time(self, execution_time: float) -> None:
+        """
+        Fold an execution time into the moving response-time average.
+        
+        This is the exact running mean until 1/count drops below RESPONSE_TIME_ALPHA,
+        then an exponentially weighted average that favours recent calls.
+        """
+        self._rt_count += 1
+        self._rt_mean += (execution_time - self._rt_mean) * max(1.0 / self._rt_count, self.RESPONSE_TIME_ALPHA)
+    
+    def _record_success_fast(self, execution_time: float, now: Optional[float] = None) -> None:
+        """
+        Record a successful operation while the circuit is closed.
+        
+        Nothing can transition here, so the lock is skipped; plain attribute
+        updates are atomic with respect to other tasks on the event loop.
+        """
+        self.successful_calls += 1
+        self._record_response_time(execution_time)
+        if self._window is not None:
+            self._window.record(True, time.monotonic() if now is None else now)
+        # Reset failure counter in closed state
+        self.failure_count = 0
+    
+    async def _record_success(self, execution_time: float, now: Optional[float] = None) -> None:
         """Record a successful operation."""
         self.successful_calls += 1
-        self.response_times.append(execution_time)
-        if len(self.response_times) > 100:
-            self.response_times.pop(0)
+        self._record_response_time(execution_time)
+        if self._window is not None:
+            self._window.record(True, time.monotonic() if now is None else now)
         
         async with self._lock:
-            if self.state == CircuitState.CLOSED:
+            if self._state == _STATE_CLOSED:
                 # Reset failure counter in closed state
                 self.failure_count = 0
-            elif self.state == CircuitState.HALF_OPEN:
+            elif self._state == _STATE_HALF_OPEN:
                 # In half-open state, count successes towards recovery
                 self.success_count += 1
                 if self.success_count >= self.half_open_success_threshold:
-                    await self._transition_to_closed()
+                    self._transition_to_closed()
     
-    async def _record_failure(self, exception: Exception, execution_time: float) -> None:
+    async def _record_failure(self, exception: Exception, execution_time: float, now: Optional[float] = None) -> None:
         """Record a failed operation."""
         self.failed_calls += 1
-        self.last_failure_time = time.time()
+        if now is None:
+            now = time.monotonic()
+        self.last_failure_time = now
+        if self._window is not None:
+            self._window.record(False, now)
         
         async with self._lock:
             self.failure_count += 1
             
             # Check if we need to open the circuit
-            if self.state == CircuitState.CLOSED and self.failure_count >= self.failure_threshold:
-                await self._transition_to_open()
-            elif self.state == CircuitState.HALF_OPEN:
+            if self._state == _STATE_CLOSED and self._should_trip(now):
+                self._transition_to_open()
+            elif self._state == _STATE_HALF_OPEN:
                 # Any failure in half-open state opens the circuit again
-                await self._transition_to_open()
+                self._transition_to_open()
     
-    async def _transition_to_open(self) -> None:
+    def _should_trip(self, now: float) -> bool:
+        """Decide whether a closed circuit should open after a failure."""
+        if self._window is None:
+            return self.failure_count >= self.failure_threshold
+        successes, failures = self._window.totals(now)
+        total = successes + failures
+        return total >= self.minimum_throughput and failures / total >= self.failure_rate_threshold
+    
+    def _transition_to_open(self) -> None:
         """Transition to open state."""
-        logger.warning(f"Circuit {self.name} transitioning to OPEN state after {self.failure_count} failures")
-        self.state = CircuitState.OPEN
-        self.last_state_change_time = time.time()
+        logger.warning("Circuit %s transitioning to OPEN state after %d failures", self.name, self.failure_count)
+        self._state = _STATE_OPEN
+        self._execute_impl = self._execute_slow
+        # Back off exponentially while the downstream keeps failing its probes
+        self._consecutive_opens += 1
+        self._open_timeout = self.recovery_timeout * min(
+            1 << min(self._consecutive_opens - 1, 5), self.MAX_RECOVERY_BACKOFF
+        )
+        self.last_state_change_time = time.monotonic()
     
-    async def _transition_to_half_open(self) -> None:
+    def _transition_to_half_open(self) -> None:
         """Transition to half-open state."""
-        logger.info(f"Circuit {self.name} transitioning to HALF-OPEN state after {self.recovery_timeout}s")
-        self.state = CircuitState.HALF_OPEN
-        self.last_state_change_time = time.time()
+        logger.info("Circuit %s transitioning to HALF-OPEN state after %ss", self.name, self._open_timeout)
+        self._state = _STATE_HALF_OPEN
+        self._execute_impl = self._execute_slow
+        self.last_state_change_time = time.monotonic()
         self.half_open_calls = 0
         self.success_count = 0
     
-    async def _transition_to_closed(self) -> None:
+    def _transition_to_closed(self) -> None:
         """Transition to closed state."""
-        logger.info(f"Circuit {self.name} transitioning to CLOSED state after {self.success_count} successful calls")
-        self.state = CircuitState.CLOSED
-        self.last_state_change_time = time.time()
+        logger.info("Circuit %s transitioning to CLOSED state after %d successful calls", self.name, self.success_count)
+        self._state = _STATE_CLOSED
+        self._execute_impl = self._closed_impl
+        self.last_state_change_time = time.monotonic()
         self.failure_count = 0
         self.success_count = 0
         self.half_open_calls = 0
+        self._consecutive_opens = 0
+        self._open_timeout = self.recovery_timeout
+        # Failures from before the outage must not re-trip the recovered circuit
+        if self._window is not None:
+            self._window.reset()
     
-    def get_stats(self) -> Dict[str, Any]:
-        """Get circuit breaker statistics."""
-        avg_response_time = sum(self.response_times) / len(self.response_times) if self.response_times else 0
-        
-        return {
-            "name": self.name,
-            "state": self.state.value,
-            "total_calls": self.total_calls,
-            "successful_calls": self.successful_calls,
-            "failed_calls": self.failed_calls,
-            "rejected_calls": self.rejected_calls,
-            "fallback_calls": self.fallback_calls,
-            "failure_count": self.failure_count,
-            "success_count": self.success_count,
-            "half_open_calls": self.half_open_calls,
-            "last_failure_time": self.last_failure_time,
-            "last_state_change_time": self.last_state_change_time,
-            "avg_response_time_ms": avg_response_time * 1000,
-        }
+    @staticmethod
+    def _wall_time(monotonic_time: float) -> float:
+        """Convert a time.monotonic() reading into a wall-clock timestamp for reporting."""
+        return time.time() - (time.monotonic() - monotonic_time)
+    
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get circuit breaker statistics.
+        
+        Returns:
+            dict[str, Any]: The breaker's stats dict, refreshed in place on every call;
+                copy it to keep a snapshot and do not mutate it
+        """
+        stats = self._stats_dict
+        stats["state"] = _STATE_VALUES[self._state]
+        stats["total_calls"] = self.total_calls
+        stats["successful_calls"] = self.successful_calls
+        stats["failed_calls"] = self.failed_calls
+        stats["rejected_calls"] = self.rejected_calls
+        stats["fallback_calls"] = self.fallback_calls
+        stats["failure_count"] = self.failure_count
+        stats["success_count"] = self.success_count
+        stats["half_open_calls"] = self.half_open_calls
+        stats["last_failure_time"] = self._wall_time(self.last_failure_time) if self.last_failure_time else 0
+        stats["last_state_change_time"] = self._wall_time(self.last_state_change_time)
+        stats["avg_response_time_ms"] = self._rt_mean * 1000
+        return stats
     
     def reset(self) -> None:
         """Reset the circuit breaker state."""
-        self.state = CircuitState.CLOSED
+        self._state = _STATE_CLOSED
+        self._execute_impl = self._closed_impl
         self.failure_count = 0
         self.success_count = 0
         self.last_failure_time = 0
-        self.last_state_change_time = time.time()
+        self.last_state_change_time = time.monotonic()
         self.half_open_calls = 0
+        self._consecutive_opens = 0
+        self._open_timeout = self.recovery_timeout
+        if self._window is not None:
+            self._window.reset()
 
 
 class CircuitOpenError(Exception):
@@ -286,11 +583,16 @@ class CircuitTimeoutError(Exception):
     pass
 
 
+class CircuitBulkheadFullError(CircuitOpenError):
+    """Exception raised when a circuit's concurrency limit is reached."""
+    pass
+
+
 class CircuitBreakerRegistry:
     """Registry for managing multiple circuit breakers."""
     
     _instance = None
-    _breakers: Dict[str, CircuitBreaker] = {}
+    _breakers: dict[str, CircuitBreaker] = {}
     
     def __new__(cls):
         """Singleton pattern implementation."""
@@ -314,8 +616,12 @@ class CircuitBreakerRegistry:
         half_open_max_calls: int = 3,
         half_open_success_threshold: int = 2,
         timeout: float = 10.0,
-        exclude_exceptions: List[type] = None,
-        fallback: Optional[Callable] = None
+        exclude_exceptions: list[type] = None,
+        fallback: Optional[Callable] = None,
+        failure_rate_threshold: Optional[float] = None,
+        minimum_throughput: int = 10,
+        max_concurrent: Optional[int] = None,
+        queue_timeout: Optional[float] = None
     ) -> CircuitBreaker:
         """Create and register a new circuit breaker."""
         breaker = CircuitBreaker(
@@ -326,16 +632,49 @@ class CircuitBreakerRegistry:
             half_open_success_threshold=half_open_success_threshold,
             timeout=timeout,
             exclude_exceptions=exclude_exceptions,
-            fallback=fallback
+            fallback=fallback,
+            failure_rate_threshold=failure_rate_threshold,
+            minimum_throughput=minimum_throughput,
+            max_concurrent=max_concurrent,
+            queue_timeout=queue_timeout
         )
         self.register_breaker(breaker)
         return breaker
     
-    def get_all_breakers(self) -> Dict[str, CircuitBreaker]:
-        """Get all registered circuit breakers."""
+    def get_or_create(self, name: str, **kwargs) -> CircuitBreaker:
+        """
+        Get a circuit breaker by name, creating and registering it if missing.
+        
+        Args:
+            name: Circuit breaker name
+            **kwargs: create_breaker() settings, used only when the breaker is created
+            
+        Returns:
+            CircuitBreaker: The registered breaker
+        """
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            breaker = self.create_breaker(name, **kwargs)
+        return breaker
+    
+    def get_all_breakers(self) -> Mapping[str, CircuitBreaker]:
+        """Get a read-only live view of all registered circuit breakers."""
+        return MappingProxyType(self._breakers)
+    
+    def get_snapshot(self) -> dict[str, CircuitBreaker]:
+        """Get a copy of the registered circuit breakers that later registrations won't change."""
         return self._breakers.copy()
     
-    def get_all_stats(self) -> Dict[str, Dict[str, Any]]:
+    def iter_stats(self) -> Iterator[tuple[str, dict[str, Any]]]:
+        """
+        Yield (name, stats) for every circuit breaker.
+        
+        Lets exporters stream stats without building an outer dict.
+        """
+        for name, breaker in self._breakers.items():
+            yield name, breaker.get_stats()
+    
+    def get_all_stats(self) -> dict[str, dict[str, Any]]:
         """Get statistics for all circuit breakers."""
         return {name: breaker.get_stats() for name, breaker in self._breakers.items()}
 
@@ -344,6 +683,11 @@ class CircuitBreakerRegistry:
 circuit_breaker_registry = CircuitBreakerRegistry()
 
 
+def get_all_stats() -> dict[str, dict[str, Any]]:
+    """Get statistics for every circuit breaker in the shared registry."""
+    return circuit_breaker_registry.get_all_stats()
+
+
 def with_circuit_breaker(
     name: str,
     failure_threshold: int = 5,
@@ -365,21 +709,21 @@ def with_circuit_breaker(
         Decorated function
     """
     def decorator(func):
-        registry = CircuitBreakerRegistry()
-        breaker = registry.get_breaker(name)
-        
-        if not breaker:
-            breaker = registry.create_breaker(
-                name=name,
-                failure_threshold=failure_threshold,
-                recovery_timeout=recovery_timeout,
-                timeout=timeout,
-                fallback=fallback
-            )
+        breaker = circuit_breaker_registry.get_or_create(
+            name,
+            failure_threshold=failure_threshold,
+            recovery_timeout=recovery_timeout,
+            timeout=timeout,
+            fallback=fallback
+        )
+        
+        # Classify once at decoration time so every call hits the cache
+        _is_coroutine_function(func)
         
         @functools.wraps(func)
         async def wrapper(*args, **kwargs):
-            return await breaker.execute(func, *args, **kwargs)
+            # Same as breaker.execute(), minus one coroutine frame per call
+            return await breaker._execute_impl(func, *args, **kwargs)
         
         return wrapper
     
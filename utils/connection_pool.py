@@ -3,17 +3,34 @@ Connection pool for external API requests.
 Implements connection pooling, request queuing, and monitoring.
 """
 import asyncio
+import functools
 import logging
 import time
-from typing import Dict, List, Optional, Any, Callable, Awaitable, Tuple
+from collections import deque
+from typing import Deque, Dict, Set, List, Optional, Any, Callable, Awaitable, Tuple
 from datetime import datetime
 from enum import Enum
 import aiohttp
 from dataclasses import dataclass, field
-from asyncio import Queue, Lock
+from asyncio import PriorityQueue
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+
+    def _json_dumps(value: Any) -> str:
+        """Serialize a request body with orjson; aiohttp expects a str."""
+        return orjson.dumps(value).decode()
+except ImportError:  # pragma: no cover - optional dependency
+    import json
+    _json_loads = json.loads
+    _json_dumps = json.dumps
 
 logger = logging.getLogger(__name__)
 
+# Pool timings are kept as time.monotonic_ns() integers and converted for stats
+NS_TO_SECONDS = 1e-9
+
 class ConnectionState(Enum):
     """Connection states."""
     IDLE = "idle"
@@ -21,24 +38,28 @@ class ConnectionState(Enum):
     CLOSED = "closed"
     UNHEALTHY = "unhealthy"
 
-@dataclass
+@dataclass(slots=True)
 class Connection:
-    """Connection class for tracking state and health."""
+    """
+    Logical connection slot for tracking state and health.
+    
+    TCP connections themselves are pooled by the pool's shared session.
+    """
     id: str
-    session: aiohttp.ClientSession
-    created_at: float = field(default_factory=time.time)
-    last_used_at: float = field(default_factory=time.time)
+    # Timestamps and durations are time.monotonic_ns() integers
+    created_at: int = field(default_factory=time.monotonic_ns)
+    last_used_at: int = field(default_factory=time.monotonic_ns)
     state: ConnectionState = ConnectionState.IDLE
     total_requests: int = 0
     successful_requests: int = 0
     failed_requests: int = 0
-    total_request_time: float = 0
+    total_request_time: int = 0
     
     def get_avg_response_time(self) -> float:
         """Get average response time."""
         if self.total_requests == 0:
             return 0
-        return self.total_request_time / self.total_requests
+        return self.total_request_time * NS_TO_SECONDS / self.total_requests
     
     def get_error_rate(self) -> float:
         """Get error rate."""
@@ -46,21 +67,30 @@ class Connection:
             return 0
         return self.failed_requests / self.total_requests
 
-@dataclass
+@dataclass(slots=True)
 class Request:
     """Request class for queuing."""
     id: str
     method: str
     url: str
-    callback: Callable[[Optional[Dict], Optional[Exception]], Awaitable[None]]
+    callback: Optional[Callable[[Optional[Dict], Optional[Exception]], Awaitable[None]]] = None
+    future: Optional[asyncio.Future] = None  # Resolved directly instead of calling callback
     kwargs: Dict[str, Any] = field(default_factory=dict)
     priority: int = 0
-    timestamp: float = field(default_factory=time.time)
+    timestamp: int = field(default_factory=time.monotonic_ns)
     timeout: Optional[float] = None
 
 class ConnectionPool:
     """Connection pool for external API requests."""
     
+    # Queue positions a request jumps ahead per priority level. Because the
+    # jump is bounded, later high-priority requests can only overtake a
+    # waiting request for a while, so low priorities never starve.
+    PRIORITY_AGING_STEP = 100
+    
+    # Most finished Request records kept for reuse
+    MAX_FREE_REQUESTS = 256
+    
     def __init__(self, name: str, base_url: str = None):
         """
         Initialize the connection pool.
@@ -81,23 +111,34 @@ class ConnectionPool:
         self.queue_timeout = 30  # seconds
         self.health_check_interval = 300  # 5 minutes
         
+        # Shared session; its connector pools and reuses the TCP connections
+        self._session: Optional[aiohttp.ClientSession] = None
+        
         # Connection pool
         self.connections: Dict[str, Connection] = {}
-        self.available_connections: List[str] = []
-        self.connection_lock = Lock()
+        # Idle connection ids; _slots bounds in-flight requests. Both are only
+        # touched between awaits, so no lock is needed.
+        self._idle: Deque[str] = deque()
+        # Ids genuinely idle; closing drops an id here in O(1) and its stale
+        # deque entry is skipped when it reaches the front
+        self._idle_ids: Set[str] = set()
+        self._slots = asyncio.Semaphore(self.max_connections)
+        self._connections_created = 0
         
         # Request queue
-        self.request_queue = Queue()
+        # Entries are (sequence - priority * PRIORITY_AGING_STEP, sequence, request)
+        self.request_queue: PriorityQueue = PriorityQueue()
         self.request_waiting_count = 0
+        self._free_requests: List[Request] = []
         
         # Metrics
         self.total_requests = 0
         self.successful_requests = 0
         self.failed_requests = 0
         self.total_queued_requests = 0
-        self.total_queue_time = 0
-        self.total_request_time = 0
-        self.created_at = time.time()
+        self.total_queue_time = 0  # ns
+        self.total_request_time = 0  # ns
+        self.created_at = time.monotonic_ns()
         
         # Background tasks
         self.queue_processor_task = None
@@ -119,6 +160,9 @@ class ConnectionPool:
             self.connection_ttl = config.get("connection_ttl", self.connection_ttl)
             self.queue_timeout = config.get("queue_timeout", self.queue_timeout)
             self.health_check_interval = config.get("health_check_interval", self.health_check_interval)
+        self._slots = asyncio.Semaphore(self.max_connections)
+        
+        self._get_session()
         
         # Initialize connections
         for i in range(self.min_connections):
@@ -140,11 +184,36 @@ class ConnectionPool:
             self.health_check_task.cancel()
         
         # Close all connections
-        for conn_id, conn in self.connections.items():
+        for conn_id in list(self.connections):
             await self._close_connection(conn_id)
         
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        
         logger.info(f"Shutdown connection pool '{self.name}'")
     
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Get the shared session, creating it on first use.
+        
+        Returns:
+            aiohttp.ClientSession: Session backing every connection in the pool
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_connections,
+                keepalive_timeout=self.connection_ttl,
+                enable_cleanup_closed=True
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.connection_timeout),
+                json_serialize=_json_dumps
+            )
+        return self._session
+    
     async def request(self, method: str, url: str, **kwargs) -> Dict[str, Any]:
         """
         Make an HTTP request through the connection pool.
@@ -168,43 +237,79 @@ class ConnectionPool:
         
         # Create future for the response
         future = asyncio.Future()
+        priority = kwargs.pop("priority", 0) if kwargs else 0
+        timeout = kwargs.pop("timeout", self.connection_timeout) if kwargs else self.connection_timeout
         
-        # Create request
-        request = Request(
-            id=request_id,
-            method=method,
-            url=full_url,
-            callback=lambda result, error: self._handle_response(future, result, error),
-            kwargs=kwargs,
-            priority=kwargs.pop("priority", 0) if kwargs else 0,
-            timeout=kwargs.pop("timeout", self.connection_timeout) if kwargs else self.connection_timeout
-        )
+        # Create request; the processor releases it once it has run, so it is
+        # not touched here after queueing
+        request = self._acquire_request(request_id, method, full_url, future, kwargs, priority, timeout)
         
         # Queue the request
-        queue_start = time.time()
+        queue_start = request.timestamp
         self.total_queued_requests += 1
         self.request_waiting_count += 1
-        await self.request_queue.put(request)
+        sequence = self.total_queued_requests
+        await self.request_queue.put((sequence - priority * self.PRIORITY_AGING_STEP, sequence, request))
         
         try:
             # Wait for response
-            result = await asyncio.wait_for(future, request.timeout)
+            result = await asyncio.wait_for(future, timeout)
             self.successful_requests += 1
             return result
         except asyncio.TimeoutError:
             self.failed_requests += 1
-            logger.warning(f"Request {request_id} timed out after {request.timeout}s")
-            raise TimeoutError(f"Request timed out after {request.timeout}s")
+            logger.warning(f"Request {request_id} timed out after {timeout}s")
+            raise TimeoutError(f"Request timed out after {timeout}s")
         except Exception as e:
             self.failed_requests += 1
             logger.error(f"Request {request_id} failed: {e}")
             raise
         finally:
             self.request_waiting_count -= 1
-            queue_time = time.time() - queue_start
-            self.total_queue_time += queue_time
+            self.total_queue_time += time.monotonic_ns() - queue_start
+    
+    def _acquire_request(
+        self,
+        request_id: str,
+        method: str,
+        url: str,
+        future: asyncio.Future,
+        kwargs: Dict[str, Any],
+        priority: int,
+        timeout: Optional[float]
+    ) -> Request:
+        """Get a Request record from the free list, or allocate one, and fill it in."""
+        if not self._free_requests:
+            return Request(
+                id=request_id,
+                method=method,
+                url=url,
+                future=future,
+                kwargs=kwargs,
+                priority=priority,
+                timeout=timeout
+            )
+        request = self._free_requests.pop()
+        request.id = request_id
+        request.method = method
+        request.url = url
+        request.future = future
+        request.kwargs = kwargs
+        request.priority = priority
+        request.timestamp = time.monotonic_ns()
+        request.timeout = timeout
+        return request
+    
+    def _release_request(self, request: Request) -> None:
+        """Return a finished Request record to the free list."""
+        # Drop references so the free list does not keep responses or callers alive
+        request.callback = None
+        request.future = None
+        request.kwargs = None
+        if len(self._free_requests) < self.MAX_FREE_REQUESTS:
+            self._free_requests.append(request)
     
-    async def _handle_response(self, future: asyncio.Future, result: Optional[Dict], error: Optional[Exception]) -> None:
+    def _handle_response(self, future: asyncio.Future, result: Optional[Dict], error: Optional[Exception]) -> None:
         """Handle the response from a request."""
         if future.done():
             return
@@ -215,30 +320,46 @@ class ConnectionPool:
             future.set_result(result)
     
     async def _process_queue(self) -> None:
-        """Process the request queue."""
+        """
+        Process the request queue.
+        
+        A connection is claimed before a request is dequeued, so a saturated
+        pool leaves requests queued in order instead of requeueing them.
+        """
         while True:
             try:
-                # Get request from queue
-                request = await self.request_queue.get()
-                
-                # Try to get an available connection
+                # Wait for a free connection
                 conn_id = await self._get_available_connection()
+                if conn_id is None:
+                    await asyncio.sleep(1)  # Connection creation is failing; back off
+                    continue
                 
-                if conn_id:
-                    # Execute request
-                    asyncio.create_task(self._execute_request(conn_id, request))
-                else:
-                    # No connection available, requeue the request
-                    await self.request_queue.put(request)
-                    await asyncio.sleep(0.1)  # Small delay to prevent high CPU usage
-                
+                # Get request from queue
+                try:
+                    entry = await self.request_queue.get()
+                except asyncio.CancelledError:
+                    self._return_connection(conn_id)
+                    raise
                 self.request_queue.task_done()
+                
+                # Execute request
+                await self._dispatch(conn_id, entry)
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error(f"Error processing request queue: {e}", exc_info=True)
                 await asyncio.sleep(1)  # Delay to prevent high CPU usage on errors
     
+    async def _dispatch(self, conn_id: str, entry: Tuple[int, int, Request]) -> None:
+        """
+        Start executing a dequeued request on the connection claimed for it.
+        
+        Args:
+            conn_id: Connection ID
+            entry: Queue entry (priority key, sequence, request)
+        """
+        asyncio.create_task(self._execute_request(conn_id, entry[2]))
+    
     async def _execute_request(self, conn_id: str, request: Request) -> None:
         """
         Execute a request using a connection.
@@ -249,95 +370,113 @@ class ConnectionPool:
         """
         conn = self.connections[conn_id]
         conn.state = ConnectionState.BUSY
-        conn.last_used_at = time.time()
+        start_time = time.monotonic_ns()
+        conn.last_used_at = start_time
         conn.total_requests += 1
         
-        start_time = time.time()
         
         try:
             # Execute request
-            async with getattr(conn.session, request.method.lower())(
-                request.url, **request.kwargs
+            async with self._get_session().request(
+                request.method, request.url, **request.kwargs
             ) as response:
                 # Read response
-                response_data = await response.json()
+                response_data = await response.json(loads=_json_loads)
                 
                 # Update connection
                 conn.successful_requests += 1
                 
                 # Call callback
-                await request.callback(response_data, None)
+                if request.future is not None:
+                    self._handle_response(request.future, response_data, None)
+                else:
+                    await request.callback(response_data, None)
         except Exception as e:
             # Update connection
             conn.failed_requests += 1
             
             # Call callback with error
-            await request.callback(None, e)
+            if request.future is not None:
+                self._handle_response(request.future, None, e)
+            else:
+                await request.callback(None, e)
             
             logger.error(f"Request {request.id} failed: {e}")
         finally:
             # Update metrics
-            request_time = time.time() - start_time
+            request_time = time.monotonic_ns() - start_time
             conn.total_request_time += request_time
             self.total_request_time += request_time
+            self._release_request(request)
             
             # Make connection available again
             if conn.total_requests >= self.max_requests_per_connection:
                 # Connection reached max requests, close it
                 await self._close_connection(conn_id)
                 await self._create_connection()
+                self._slots.release()
             else:
-                # Make connection available again
-                conn.state = ConnectionState.IDLE
-                async with self.connection_lock:
-                    self.available_connections.append(conn_id)
+                self._return_connection(conn_id)
+    
+    def _return_connection(self, conn_id: str) -> None:
+        """
+        Make a connection available again and free its slot.
+        
+        Args:
+            conn_id: Connection ID
+        """
+        conn = self.connections.get(conn_id)
+        # The connection may have been closed meanwhile, e.g. during shutdown
+        if conn is not None:
+            conn.state = ConnectionState.IDLE
+            self._idle.append(conn_id)
+            self._idle_ids.add(conn_id)
+        self._slots.release()
     
     async def _get_available_connection(self) -> Optional[str]:
         """
-        Get an available connection.
+        Get an available connection, waiting for a free slot if the pool is busy.
+        
+        The caller owns one slot until _execute_request releases it.
         
         Returns:
-            Optional[str]: Connection ID or None if no connection available
+            Optional[str]: Connection ID or None if a connection could not be created
         """
-        async with self.connection_lock:
-            if self.available_connections:
-                # Get first available connection
-                conn_id = self.available_connections.pop(0)
+        await self._slots.acquire()
+        # Taken without yielding to the event loop
+        while self._idle:
+            conn_id = self._idle.popleft()
+            if conn_id in self._idle_ids:
+                self._idle_ids.discard(conn_id)
                 return conn_id
-            elif len(self.connections) < self.max_connections:
-                # Create new connection
-                new_conn_id = await self._create_connection()
-                if new_conn_id and new_conn_id in self.available_connections:
-                    self.available_connections.remove(new_conn_id)
-                return new_conn_id
-            
-            return None
+        
+        conn_id = await self._create_connection(available=False)
+        if conn_id is None:
+            self._slots.release()
+        return conn_id
     
-    async def _create_connection(self) -> Optional[str]:
+    async def _create_connection(self, available: bool = True) -> Optional[str]:
         """
         Create a new connection.
         
+        Args:
+            available: Whether to add the connection to the idle list
+        
         Returns:
             Optional[str]: Connection ID or None if creation failed
         """
         try:
-            conn_id = f"conn_{self.name}_{len(self.connections) + 1}"
-            
-            # Create session
-            timeout = aiohttp.ClientTimeout(total=self.connection_timeout)
-            session = aiohttp.ClientSession(timeout=timeout)
+            self._connections_created += 1
+            conn_id = f"conn_{self.name}_{self._connections_created}"
             
             # Create connection
-            conn = Connection(
-                id=conn_id,
-                session=session
-            )
+            conn = Connection(id=conn_id)
             
             # Add to pool
             self.connections[conn_id] = conn
-            
-            async with self.connection_lock:
-                self.available_connections.append(conn_id)
+            if available:
+                self._idle.append(conn_id)
+                self._idle_ids.add(conn_id)
             
             logger.debug(f"Created new connection {conn_id}")
             return conn_id
@@ -356,16 +495,11 @@ class ConnectionPool:
             conn = self.connections[conn_id]
             
             try:
-                # Close session
-                await conn.session.close()
-                
                 # Update state
                 conn.state = ConnectionState.CLOSED
                 
                 # Remove from available connections
-                async with self.connection_lock:
-                    if conn_id in self.available_connections:
-                        self.available_connections.remove(conn_id)
+                self._idle_ids.discard(conn_id)
                 
                 # Remove from pool
                 del self.connections[conn_id]
@@ -390,7 +524,7 @@ class ConnectionPool:
         conn = self.connections[conn_id]
         
         # Check if connection is too old
-        if time.time() - conn.created_at > self.connection_ttl:
+        if (time.monotonic_ns() - conn.created_at) * NS_TO_SECONDS > self.connection_ttl:
             logger.debug(f"Connection {conn_id} is too old, marking as unhealthy")
             conn.state = ConnectionState.UNHEALTHY
             return False
@@ -426,7 +560,7 @@ class ConnectionPool:
                     await self._create_connection()
                 
                 logger.debug(f"Health check completed. Connections: {len(self.connections)}, " +
-                           f"Available: {len(self.available_connections)}, " +
+                           f"Available: {len(self._idle_ids)}, " +
                            f"Unhealthy: {len(unhealthy_connections)}")
             except asyncio.CancelledError:
                 break
@@ -440,12 +574,14 @@ class ConnectionPool:
         Returns:
             Dict: Connection pool stats
         """
-        now = time.time()
-        uptime = now - self.created_at
+        now = time.monotonic_ns()
+        uptime = (now - self.created_at) * NS_TO_SECONDS
+        total_queue_time = self.total_queue_time * NS_TO_SECONDS
+        total_request_time = self.total_request_time * NS_TO_SECONDS
         
         # Calculate metrics
-        avg_queue_time = self.total_queue_time / self.total_queued_requests if self.total_queued_requests > 0 else 0
-        avg_request_time = self.total_request_time / self.total_requests if self.total_requests > 0 else 0
+        avg_queue_time = total_queue_time / self.total_queued_requests if self.total_queued_requests > 0 else 0
+        avg_request_time = total_request_time / self.total_requests if self.total_requests > 0 else 0
         success_rate = self.successful_requests / self.total_requests if self.total_requests > 0 else 0
         
         return {
@@ -453,7 +589,7 @@ class ConnectionPool:
             "uptime": uptime,
             "connections": {
                 "total": len(self.connections),
-                "available": len(self.available_connections),
+                "available": len(self._idle_ids),
                 "min": self.min_connections,
                 "max": self.max_connections
             },
@@ -471,15 +607,15 @@ class ConnectionPool:
             "timing": {
                 "avg_queue_time": avg_queue_time,
                 "avg_request_time": avg_request_time,
-                "total_queue_time": self.total_queue_time,
-                "total_request_time": self.total_request_time
+                "total_queue_time": total_queue_time,
+                "total_request_time": total_request_time
             },
             "connections_detail": [
                 {
                     "id": conn.id,
                     "state": conn.state.value,
-                    "age": now - conn.created_at,
-                    "last_used": now - conn.last_used_at if conn.last_used_at else None,
+                    "age": (now - conn.created_at) * NS_TO_SECONDS,
+                    "last_used": (now - conn.last_used_at) * NS_TO_SECONDS if conn.last_used_at else None,
                     "requests": conn.total_requests,
                     "success_rate": conn.successful_requests / conn.total_requests if conn.total_requests > 0 else 0,
                     "avg_response_time": conn.get_avg_response_time()
@@ -488,6 +624,154 @@ class ConnectionPool:
             ]
         }
 
+class BatchingConnectionPool(ConnectionPool):
+    """
+    Connection pool that coalesces compatible queued requests into one HTTP call.
+    
+    For endpoints that accept batches (JSON-RPC arrays, multi-id lookups):
+    requests sharing a batch key that are queued within max_latency of each
+    other are sent together, at most max_batch_size per call.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        base_url: str = None,
+        batch_key: Callable[[Request], Optional[Any]] = None,
+        build_batch: Callable[[List[Request]], Request] = None,
+        split_response: Callable[[Any, List[Request]], List[Any]] = None,
+        max_batch_size: int = 50,
+        max_latency: float = 0.005
+    ):
+        """
+        Initialize the batching connection pool.
+        
+        Args:
+            name: Pool name
+            base_url: Base URL for API requests
+            batch_key: Returns a hashable key for requests that may share a batch, or None
+            build_batch: Builds the single Request (method, url, kwargs) that carries a batch
+            split_response: Splits the batch response into one result per request, in order
+            max_batch_size: Maximum requests per batch
+            max_latency: Seconds to wait for more requests after the first of a batch
+        """
+        super().__init__(name, base_url)
+        self.batch_key = batch_key
+        self.build_batch = build_batch
+        self.split_response = split_response
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self.total_batches = 0
+    
+    async def _dispatch(self, conn_id: str, entry: Tuple[int, int, Request]) -> None:
+        """Collect requests that batch with entry, then run them as one request."""
+        try:
+            key = self.batch_key(entry[2])
+        except Exception as e:
+            logger.error(f"Failed to compute batch key for request {entry[2].id}: {e}", exc_info=True)
+            await self._scatter_batch([entry[2]], None, e)
+            self._return_connection(conn_id)
+            return
+        if key is None:
+            asyncio.create_task(self._execute_request(conn_id, entry[2]))
+            return
+        
+        batch = [entry]
+        held = []  # Entries for other keys, requeued with their original position
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_latency
+        try:
+            while len(batch) < self.max_batch_size:
+                try:
+                    other = self.request_queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        async with asyncio.timeout(remaining):
+                            other = await self.request_queue.get()
+                    except TimeoutError:
+                        break
+                self.request_queue.task_done()
+                try:
+                    other_key = self.batch_key(other[2])
+                except Exception as e:
+                    # Only the request with the bad key fails; the batch goes on
+                    logger.error(f"Failed to compute batch key for request {other[2].id}: {e}", exc_info=True)
+                    await self._scatter_batch([other[2]], None, e)
+                    continue
+                if other_key == key:
+                    batch.append(other)
+                else:
+                    held.append(other)
+        except asyncio.CancelledError:
+            for queued in batch + held:
+                self.request_queue.put_nowait(queued)
+            self._return_connection(conn_id)
+            raise
+        except Exception as e:
+            # Never drop dequeued entries or the claimed slot on an unexpected error
+            logger.error(f"Failed to collect batch: {e}", exc_info=True)
+            for queued in held:
+                self.request_queue.put_nowait(queued)
+            await self._scatter_batch([queued[2] for queued in batch], None, e)
+            self._return_connection(conn_id)
+            return
+        
+        for queued in held:
+            self.request_queue.put_nowait(queued)
+        
+        if len(batch) == 1:
+            asyncio.create_task(self._execute_request(conn_id, entry[2]))
+            return
+        
+        requests = [queued[2] for queued in batch]
+        try:
+            batch_request = self.build_batch(requests)
+        except Exception as e:
+            logger.error(f"Failed to build batch of {len(requests)} requests: {e}", exc_info=True)
+            await self._scatter_batch(requests, None, e)
+            self._return_connection(conn_id)
+            return
+        batch_request.future = None
+        batch_request.callback = functools.partial(self._scatter_batch, requests)
+        self.total_batches += 1
+        asyncio.create_task(self._execute_request(conn_id, batch_request))
+    
+    async def _scatter_batch(self, requests: List[Request], result: Any, error: Optional[Exception]) -> None:
+        """Deliver a batch response, or its error, to every request in the batch."""
+        if error is None:
+            try:
+                results = self.split_response(result, requests)
+                if len(results) != len(requests):
+                    raise ValueError(f"Batch response has {len(results)} results for {len(requests)} requests")
+            except Exception as e:
+                error = e
+        
+        for i, request in enumerate(requests):
+            item = None if error is not None else results[i]
+            if request.future is not None:
+                self._handle_response(request.future, item, error)
+            else:
+                await request.callback(item, error)
+            self._release_request(request)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get connection pool statistics, including batching.
+        
+        Returns:
+            Dict: Connection pool stats
+        """
+        stats = super().get_stats()
+        stats["batching"] = {
+            "total_batches": self.total_batches,
+            "max_batch_size": self.max_batch_size,
+            "max_latency": self.max_latency
+        }
+        return stats
+
 # Create a registry for connection pools
 connection_pools: Dict[str, ConnectionPool] = {}
 
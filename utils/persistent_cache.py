@@ -0,0 +1,215 @@
+"""
+Persistent cross-process cache used as an L2 behind in-memory caches.
+Backed by Redis when REDIS_URL is configured, otherwise by a local SQLite file.
+"""
+import os
+import time
+import asyncio
+import sqlite3
+import logging
+import threading
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+    import json
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # pragma: no cover - optional dependency
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL", "")
+# Absolute, so the database doesn't land in whatever the working directory is
+DATA_DIR = os.path.abspath(os.path.expanduser(os.getenv("BLAZE_DATA_DIR", "~/.cache/blaze")))
+CACHE_SQLITE_PATH = os.path.abspath(os.getenv("CACHE_SQLITE_PATH", os.path.join(DATA_DIR, "blaze_cache.sqlite3")))
+REDIS_RETRY_COOLDOWN = 30.0  # Seconds to skip Redis after a failed operation
+
+
+def dumps(value: Any) -> bytes:
+    """Serialize a value for storage in the L2 cache."""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+def loads(raw: bytes) -> Any:
+    """Deserialize a value read from the L2 cache."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+class PersistentCache:
+    """Key/value cache with TTL that survives process restarts."""
+
+    def __init__(self, prefix: str = "", redis_url: str = REDIS_URL, sqlite_path: str = CACHE_SQLITE_PATH):
+        """
+        Initialize the persistent cache.
+
+        Args:
+            prefix: Namespace prepended to every key
+            redis_url: Redis connection URL; SQLite is used when empty or redis is unavailable
+            sqlite_path: Path of the SQLite database file
+        """
+        self.prefix = prefix
+        self.redis_url = redis_url
+        self.sqlite_path = sqlite_path
+        self._redis = None
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = asyncio.Lock()
+        self._db_lock = threading.Lock()
+        self._disabled = False
+        self._redis_retry_at = 0.0  # Monotonic; Redis is skipped until then after a failure
+
+    async def _backend(self):
+        """Lazily open the configured backend."""
+        if self._redis is not None or self._db is not None or self._disabled:
+            return
+        async with self._lock:
+            if self._redis is not None or self._db is not None or self._disabled:
+                return
+            try:
+                if self.redis_url and aioredis is not None:
+                    self._redis = aioredis.from_url(self.redis_url)
+                else:
+                    self._db = await asyncio.to_thread(self._open_sqlite)
+            except Exception as e:
+                logger.warning(f"Persistent cache unavailable, continuing without L2: {e}")
+                self._disabled = True
+
+    def _redis_usable(self) -> bool:
+        """Check whether Redis is configured and not cooling down after a failure."""
+        return self._redis is not None and time.monotonic() >= self._redis_retry_at
+
+    def _redis_failed(self, op: str, full_key: str, error: Exception) -> None:
+        """Skip Redis for a cooldown period, logging once per outage rather than per call."""
+        self._redis_retry_at = time.monotonic() + REDIS_RETRY_COOLDOWN
+        logger.warning(
+            f"Persistent cache {op} failed for {full_key}: {error}; "
+            f"skipping Redis for {REDIS_RETRY_COOLDOWN:.0f}s"
+        )
+
+    def _open_sqlite(self) -> sqlite3.Connection:
+        """Open the SQLite database and create the cache table."""
+        os.makedirs(os.path.dirname(self.sqlite_path), exist_ok=True)
+        db = sqlite3.connect(self.sqlite_path, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+        )
+        db.commit()
+        return db
+
+    def _sqlite_get(self, key: str) -> Optional[bytes]:
+        with self._db_lock:
+            return self._sqlite_get_locked(key)
+
+    def _sqlite_get_locked(self, key: str) -> Optional[bytes]:
+        row = self._db.execute("SELECT value, expires_at FROM cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        if row[1] < time.time():
+            self._db.execute("DELETE FROM cache WHERE key = ?", (key,))
+            self._db.commit()
+            return None
+        return row[0]
+
+    def _sqlite_setex(self, key: str, ttl: int, value: bytes) -> None:
+        with self._db_lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, time.time() + ttl),
+            )
+            self._db.commit()
+
+    def _sqlite_delete(self, key: str) -> None:
+        with self._db_lock:
+            self._db.execute("DELETE FROM cache WHERE key = ?", (key,))
+            self._db.commit()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """
+        Get a raw cached value.
+
+        Args:
+            key: Cache key (without prefix)
+
+        Returns:
+            Optional[bytes]: Serialized value, or None on miss/expiry/error
+        """
+        await self._backend()
+        full_key = self.prefix + key
+        if self._redis is not None:
+            if not self._redis_usable():
+                return None
+            try:
+                return await self._redis.get(full_key)
+            except Exception as e:
+                self._redis_failed("get", full_key, e)
+                return None
+        try:
+            if self._db is not None:
+                return await asyncio.to_thread(self._sqlite_get, full_key)
+        except Exception as e:
+            logger.warning(f"Persistent cache get failed for {full_key}: {e}")
+        return None
+
+    async def setex(self, key: str, ttl: int, value: bytes) -> None:
+        """
+        Store a raw value with a TTL.
+
+        Args:
+            key: Cache key (without prefix)
+            ttl: Time to live in seconds
+            value: Serialized value
+        """
+        await self._backend()
+        full_key = self.prefix + key
+        if self._redis is not None:
+            if self._redis_usable():
+                try:
+                    await self._redis.setex(full_key, ttl, value)
+                except Exception as e:
+                    self._redis_failed("set", full_key, e)
+            return
+        try:
+            if self._db is not None:
+                await asyncio.to_thread(self._sqlite_setex, full_key, ttl, value)
+        except Exception as e:
+            logger.warning(f"Persistent cache set failed for {full_key}: {e}")
+
+    async def delete(self, key: str) -> None:
+        """
+        Remove a cached value.
+
+        Args:
+            key: Cache key (without prefix)
+        """
+        await self._backend()
+        full_key = self.prefix + key
+        if self._redis is not None:
+            if self._redis_usable():
+                try:
+                    await self._redis.delete(full_key)
+                except Exception as e:
+                    self._redis_failed("delete", full_key, e)
+            return
+        try:
+            if self._db is not None:
+                await asyncio.to_thread(self._sqlite_delete, full_key)
+        except Exception as e:
+            logger.warning(f"Persistent cache delete failed for {full_key}: {e}")
+
+    async def close(self) -> None:
+        """Close the underlying backend."""
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None
+        if self._db is not None:
+            self._db.close()
+            self._db = None